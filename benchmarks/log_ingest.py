@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+"""Packets/sec received by the old awaited receive loop compared to LogProtocol.
+
+Both receivers decode every datagram the way the log pipeline does. A
+separate process floods a loopback port and each receiver is measured by
+how many datagrams it handles in a fixed window. The baseline is the
+asyncio_dgram loop the bot used before LogProtocol and needs
+`pip install asyncio_dgram`.
+
+Run from the repository root: python3 benchmarks/log_ingest.py
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name: str, path: str):
+    # Load the module on its own so the bot config and Telegram client are not needed
+    spec = importlib.util.spec_from_file_location(name, ROOT / path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+sockets = load("socket_utils", "hlbridge/utils/socket.py")
+
+PACKET = b'\xff\xff\xff\xfflog L 10/18/2025 - 20:14:07: "Player<3><STEAM_0:1:1234><gordon>" say "gg wp"\n'
+DURATION = 3.0
+
+
+def send(port: int, duration: float):
+    out = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for _ in range(256):
+            out.sendto(PACKET, ("127.0.0.1", port))
+    out.close()
+
+
+async def measure(port: int, count) -> float:
+    # The sender runs in its own process and floods the port; what the
+    # receiver manages to handle in that window is its throughput.
+    sender = multiprocessing.Process(target=send, args=(port, DURATION + 0.5))
+    sender.start()
+    await asyncio.sleep(0.25)
+    start_count, start = count(), time.perf_counter()
+    await asyncio.sleep(DURATION)
+    rate = (count() - start_count) / (time.perf_counter() - start)
+    await asyncio.to_thread(sender.join)
+    return rate
+
+
+async def baseline(port: int) -> float:
+    import asyncio_dgram
+
+    sock = await asyncio_dgram.bind(("127.0.0.1", port))
+    received = 0
+
+    async def receive():
+        nonlocal received
+        while True:
+            l, _ = await sock.recv()
+            l[4:].decode(errors='replace').replace('\n', '')
+            received += 1
+
+    task = asyncio.create_task(receive())
+    rate = await measure(port, lambda: received)
+    task.cancel()
+    sock.close()
+    return rate
+
+
+async def protocol(port: int) -> float:
+    received = 0
+
+    def handler(data, addr):
+        nonlocal received
+        str(memoryview(data)[4:], 'utf-8', 'replace').replace('\n', '')
+        received += 1
+
+    transport = await sockets.bind_datagram_endpoint("127.0.0.1", port, handler)
+    rate = await measure(port, lambda: received)
+    transport.close()
+    return rate
+
+
+async def bench(name: str, func, port: int) -> float:
+    rate = await func(port)
+    print(f"{name:<16} {rate:>12,.0f} packets/sec")
+    return rate
+
+
+async def main():
+    sockets.logger.remove()
+    before = await bench("asyncio_dgram", baseline, 27900)
+    after = await bench("LogProtocol", protocol, 27901)
+    print(f"speedup          {after / before:>12.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
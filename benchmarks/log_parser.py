@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+"""Lines/sec of the log parser compared to the old per-datagram regex chain.
+
+The "all events" run enables every event type, as on a kill feed server.
+
+Run from the repository root: python3 benchmarks/log_parser.py
+"""
+
+import importlib.util
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name: str, path: str):
+    # Load the module on its own so the bot config and Telegram client are not needed
+    spec = importlib.util.spec_from_file_location(name, ROOT / path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+logparser = load("logparser", "hlbridge/utils/logparser.py")
+
+HEADER = b"\xff\xff\xff\xff"
+STAMP = "log L 10/18/2025 - 20:14:07: "
+LINES = [
+    f'{STAMP}"^1Player<3><STEAM_0:1:1234><gordon>" say "gg wp"',
+    f'{STAMP}"Killer<4><STEAM_0:0:42><barney>" killed "Victim<5><STEAM_0:1:7><gina>" with "crossbow"',
+    f'{STAMP}"Player<3><STEAM_0:1:1234><gordon>" committed suicide with "worldspawn" (world)',
+    f'{STAMP}"Player<3><STEAM_0:1:1234><gordon>" disconnected',
+    f'{STAMP}"New<6><STEAM_0:0:9><>" connected, address "10.0.0.5:27005"',
+    f'{STAMP}"New<6><STEAM_0:0:9><>" entered the game',
+    f'{STAMP}Started map "crossfire" (CRC "-1287350373")',
+    f'{STAMP}Server cvar "mp_timelimit" = "30"',
+]
+DATAGRAMS = [HEADER + line.encode() + b"\n" for line in LINES] * 2000
+
+
+def baseline(datagrams, log_prefix="log L"):
+    out = 0
+    for l in datagrams:
+        l = l[4:].decode(errors='replace').replace('\n', '')
+        l = re.sub(r'\^\d', '', l)
+        saymatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" say "(.*)"')
+        startedmapmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: Started map "(.*?)"')
+        matches = [
+            (saymatch, lambda g: f'{g[0]}: {g[2]}'),
+            (startedmapmatch, lambda g: f'Started map "{g[0]}"')
+        ]
+        for pattern, formatter in matches:
+            m = pattern.match(l)
+            if m and formatter(m.groups()):
+                out += 1
+    return out
+
+
+def parser(datagrams, events=logparser.DEFAULT_EVENTS):
+    p = logparser.LogParser(48, events)
+    format_event = logparser.format_event
+    out = 0
+    for d in datagrams:
+        event = p.parse_datagram(d)
+        if event is not None and format_event(event):
+            out += 1
+    return out
+
+
+def parser_all_events(datagrams):
+    return parser(datagrams, logparser.EVENT_TYPES)
+
+
+def bench(name, func, rounds=5):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(DATAGRAMS)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(DATAGRAMS) / best
+    print(f"{name:<10} {rate:>12,.0f} lines/sec")
+    return rate
+
+
+if __name__ == "__main__":
+    assert baseline(DATAGRAMS) == parser(DATAGRAMS)
+    before = bench("before", baseline)
+    after = bench("after", parser)
+    print(f"speedup    {after / before:>12.1f}x")
+    bench("all events", parser_all_events)
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+"""Player list replies/sec of the netinfo parser compared to the old index() lookups.
+
+"parse" turns a 32-player reply into per-player fields, "format" also
+renders the lines shown in Telegram, as get_players used to return them.
+
+Run from the repository root: python3 benchmarks/netinfo_parser.py
+"""
+
+import importlib.util
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name: str):
+    # Import the modules without running the package __init__, so the bot
+    # config and Telegram client are not needed
+    for package in ("hlbridge", "hlbridge.utils"):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [str(ROOT / package.replace(".", "/"))]
+            sys.modules[package] = module
+    return importlib.import_module(f"hlbridge.utils.{name}")
+
+
+netinfo = load("netinfo")
+hlserver = load("hlserver")
+utils = load("utils")
+
+PLAYERS = 32
+HEADER = b"\xff\xff\xff\xffnetinfo 0 3 "
+
+
+def reply_49():
+    fields = [f"\\players\\{PLAYERS}"]
+    for i in range(PLAYERS):
+        fields.append(f"\\p{i}name\\^1Player {i}\\p{i}frags\\{i * 3}\\p{i}time\\{i * 61.5}")
+    return HEADER + "".join(fields).encode()
+
+
+def reply_48():
+    fields = [f"{i}\\^2Player {i}\\{i * 3}\\{i * 61.5}" for i in range(PLAYERS)]
+    return HEADER + "\\".join(fields).encode()
+
+
+def baseline(data, protocol, render=False):
+    # The old HLServer.get_players
+    data = data[16:]
+    data = data.decode(errors='replace')
+    data = "\\" + data.replace("'", ' ').replace('\n', '')
+    data = data.split("\\")[1:]
+
+    if data[-1] == '':
+        data = data[:-1]
+
+    players_list = {}
+    if protocol == 49:
+        if 'players' in data:
+            num_players = int(data[data.index('players') + 1])
+            for i in range(num_players):
+                name = data[data.index(f"p{i}name") + 1]
+                frags = data[data.index(f"p{i}frags") + 1]
+                time = data[data.index(f"p{i}time") + 1]
+                players_list[i] = [name, frags, time]
+    else:
+        for i in range(0, len(data), 4):
+            if i + 3 < len(data):
+                players_list[data[i]] = [data[i + 1], data[i + 2], data[i + 3]]
+
+    if not render:
+        return players_list
+
+    return [
+        f"{index} {utils.remove_color_tags(info[0])} [{info[1]}] ({utils.format_time(info[2])})"
+        for index, info in players_list.items()
+    ]
+
+
+def parser(data, protocol, render=False):
+    players = netinfo.parse_players(data, protocol)
+    if not render:
+        return players
+    return [hlserver.format_player(player) for player in players]
+
+
+def bench(name, func, data, protocol, render, rounds=5, count=5000):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(count):
+            func(data, protocol, render)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = count / best
+    print(f"{name:<24} {rate:>10,.0f} replies/sec")
+    return rate
+
+
+if __name__ == "__main__":
+    for protocol, data in ((49, reply_49()), (48, reply_48())):
+        assert baseline(data, protocol, True) == parser(data, protocol, True)
+        for render in (False, True):
+            label = f"{'format' if render else 'parse'} {protocol}"
+            before = bench(f"before ({label})", baseline, data, protocol, render)
+            after = bench(f"after ({label})", parser, data, protocol, render)
+            print(f"{'speedup':<24} {after / before:>10.1f}x")
@@ -2,8 +2,8 @@
 # Copyright (c) 2025 Elinsrc
 
 import asyncio
-import re
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Union
 
 from loguru import logger
 
@@ -14,17 +14,31 @@ from hydrogram.errors import BadRequest
 from hydrogram.raw.all import layer
 
 from .utils import (
-    Socket,
-    remove_color_tags,
-    get_version_number,
-    get_commit
+    LogListener,
+    LogPipeline,
+    Outbox,
+    PRIORITY_REPLY,
+    SendScheduler,
+    bind_datagram_endpoint,
+    parse_events,
+    udp_pool,
+    get_version
 )
 
 from .config import (
     API_ID,
     API_HASH,
     BOT_TOKEN,
-    WORKERS
+    WORKERS,
+    COALESCE_WINDOW,
+    COALESCE_MAX_CHARS,
+    COALESCE_EDIT,
+    QUEUE_SIZE,
+    QUEUE_OVERFLOW,
+    LOG_LISTENER_PORT,
+    CHAT_RATE_LIMIT,
+    GLOBAL_RATE_LIMIT,
+    CHAT_HISTORY
 )
 
 
@@ -42,15 +56,43 @@ class HLBridge(Client):
             plugins={"root": "hlbridge.plugins"},
             sleep_threshold=180,
         )
-        self.server_tasks: Dict[str, asyncio.Task] = {}
-        self.server_sockets: Dict[str, Socket] = {}
+        self.server_transports: Dict[str, asyncio.DatagramTransport] = {}
+        self.server_ports: Dict[str, int] = {}
+        self.pipelines: Dict[str, LogPipeline] = {}
+        # Startup and row changes of one server are applied one at a time
+        self.server_locks: Dict[str, asyncio.Lock] = {}
+        self.listener: Optional[LogListener] = None
+        self.scheduler = SendScheduler(CHAT_RATE_LIMIT, GLOBAL_RATE_LIMIT)
         self.chat_id: Optional[int] = None
         self.topic_id: Optional[int] = None
+        self.database_connected: Optional[asyncio.Task] = None
 
     async def start(self):
+        from .database import database
+        timings: List[str] = []
+        phase_start = time.monotonic()
+
+        def phase_done(phase: str):
+            nonlocal phase_start
+            now = time.monotonic()
+            timings.append(f"{phase} {(now - phase_start) * 1000:.0f} ms")
+            phase_start = now
+
+        # Logging in to Telegram and opening the database don't depend on each
+        # other; only loading the plugins in initialize() waits for the database.
+        self.database_connected = asyncio.create_task(database.connect())
+        _, _, (version_number, commit) = await asyncio.gather(
+            super().start(), self.database_connected, asyncio.to_thread(get_version)
+        )
+        phase_done("login, database and plugins")
+
         from .database.settings import get_settings
-        from .database.servers import get_servers
-        await super().start()
+        from .database.servers import add_listener, get_servers
+        from .database.chats import known_chats
+        from .database.user_names import name_cache
+
+        await asyncio.gather(name_cache.warm(), known_chats.ensure_loaded())
+        phase_done("caches")
 
         logger.info(f"HLBridge running with Hydrogram v{hydrogram.__version__} (Layer {layer}) started on @{self.me.username}.")
 
@@ -62,110 +104,181 @@ class HLBridge(Client):
                 break
             logger.info("CHAT_ID and TOPIC_ID is not configured. Waiting for /setup")
             await asyncio.sleep(5)
+        phase_done("settings")
 
         start_message = (
             "<b>HLBridge started!</b>\n\n"
-            f"<b>Version number:</b> <code>r{get_version_number()} ({get_commit()})</code>\n"
+            f"<b>Version number:</b> <code>r{version_number} ({commit})</code>\n"
             f"<b>Hydrogram:</b> <code>v{hydrogram.__version__}</code>"
         )
 
         await self.send_message(chat_id=self.chat_id, text=start_message, message_thread_id=self.topic_id)
+        phase_done("start message")
+
+        if LOG_LISTENER_PORT:
+            self.listener = LogListener("127.0.0.1", LOG_LISTENER_PORT)
+            await self.listener.start()
+
+        # Servers are started, stopped or rebound as their rows change, also
+        # while the others are still starting
+        add_listener(self.on_server_changed)
 
         servers = await get_servers(active_only=True)
-        for server in servers:
-            await self.start_server_monitoring(server)
+        logger.info(f"Starting monitoring for {len(servers)} active servers...")
+        await asyncio.gather(*(self.start_listed_server(server) for server in servers))
+        phase_done("servers")
+
+        logger.info(f"Startup took {', '.join(timings)}")
+
+    async def initialize(self):
+        # The plugins import the database modules, which take the connection when imported
+        if self.database_connected is not None:
+            await self.database_connected
+        await super().initialize()
+
+    async def send_message(self, chat_id: Union[int, str], text: str, *args, priority: int = PRIORITY_REPLY, **kwargs):
+        # Every message of the bridge, replies included, is paced by the scheduler
+        await self.scheduler.acquire(chat_id, priority)
+        return await super().send_message(chat_id, text, *args, **kwargs)
+
+
+    async def edit_message_text(self, chat_id: Union[int, str], message_id: int, text: str, *args, priority: int = PRIORITY_REPLY, **kwargs):
+        await self.scheduler.acquire(chat_id, priority)
+        return await super().edit_message_text(chat_id, message_id, text, *args, **kwargs)
+
+
+    def server_lock(self, server_name: str) -> asyncio.Lock:
+        return self.server_locks.setdefault(server_name, asyncio.Lock())
 
-    async def send_to_telegram(self, sock: Socket, log_prefix: str, topic_id: int, server_name: str):
-        while True:
-                l = await sock.receive()
-                l = l[4:].decode(errors='replace').replace('\n', '')
-                l = remove_color_tags(l)
-
-                saymatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" say "(.*)"')
-                startedmapmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: Started map "(.*?)"')
-                # entermatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" entered the game')
-                # disconnectmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" disconnected')
-                # suicidematch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" committed suicide with "(.*)"')
-                # waskilledmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" committed suicide with "(.*)" \(.*\)')
-                # killedmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" killed "(.*)<[^>]+><(.*)><[^>]+>" with "(.*)"')
-                # kickmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: Kick: "(.*)<[^>]+><(.*)><>" was kicked by "(.*)" \(message "(.*)"\)')
-                # changematch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><[^>]+>" changed name to "(.*)"')
-                # connectedmatch = re.compile(fr'{log_prefix} \d\d\/\d\d\/\d\d\d\d - \d\d\:\d\d\:\d\d\: "(.*)<[^>]+><(.*)><>" connected, address "([^"]+)"')
-
-                matches = [
-                    (saymatch, lambda g: f'{g[0]}: {g[2]}'),
-                    (startedmapmatch, lambda g: f'Started map "{g[0]}"')
-                ]
-
-                #     (suicidematch, lambda g: f'"{g[0]}" committed suicide with "{g[2]}"'),
-                #     (waskilledmatch, lambda g: f'"{g[0]}" committed suicide with "{g[2]}"'),
-                #     (killedmatch, lambda g: f'"{g[0]}" killed "{g[2]}" with "{g[4]}"',
-                #     (kickmatch, lambda g: f'Player "{g[0]}" was kicked with message: "{g[3]}"'),
-                #     (changematch, lambda g: f'Player "{g[0]}" changed name to: "{g[2]}"'),
-                #     (entermatch, lambda g: f'Player "{g[0]}" has joined the game'),
-                #     (disconnectmatch, lambda g: f'Player "{g[0]}" has left the game'),
-                #     (connectedmatch, lambda g: f'Player "{g[0]}" connected')
-
-                for pattern, formatter in matches:
-                    m = pattern.match(l)
-                    if m:
-                        g = m.groups()
-                        text = formatter(g)
-                        if text:  # Only send message if formatting function returned a valid text
-                            await self.send_message(chat_id=self.chat_id, text=text, message_thread_id=topic_id, disable_web_page_preview=True, disable_notification=True)
-                            logger.info(f"[{server_name}] <<< {text} >>>")
+
+    async def start_listed_server(self, server: Dict):
+        async with self.server_lock(server["server_name"]):
+            # A change published since the list was read has started it already
+            if server["server_name"] not in self.pipelines:
+                await self.start_server_monitoring(server)
 
 
     async def start_server_monitoring(self, server: Dict) -> bool:
+        from .database.chat_history import chat_history
         server_name = server["server_name"]
-        if server_name in self.server_tasks:
+        if server_name in self.pipelines:
             await self.stop_server_monitoring(server_name)
 
-        sock = Socket()
-        await sock.connect("127.0.0.1", server["log_port"])
-        log_prefix = "log" if server["protocol"] == 49 else "log L"
-
-        task = asyncio.create_task(self.send_to_telegram(sock, log_prefix, server["topic_id"], server_name))
+        outbox = Outbox(
+            self,
+            self.chat_id,
+            server["topic_id"],
+            window=COALESCE_WINDOW,
+            max_chars=COALESCE_MAX_CHARS,
+            edit=COALESCE_EDIT,
+            queue_size=QUEUE_SIZE,
+            overflow=QUEUE_OVERFLOW
+        )
+        pipeline = LogPipeline(
+            server_name,
+            server["protocol"],
+            parse_events(server["log_events"]),
+            outbox,
+            chat_history if CHAT_HISTORY else None
+        )
 
-        self.server_tasks[server_name] = task
-        self.server_sockets[server_name] = sock
+        if self.listener is not None:
+            self.listener.add_route("127.0.0.1", server["port"], pipeline)
+            self.server_ports[server_name] = server["port"]
+        else:
+            # Datagrams are parsed as they arrive; delivery happens in the
+            # outbox task, so the socket is drained while Telegram makes us wait.
+            self.server_transports[server_name] = await bind_datagram_endpoint(
+                "127.0.0.1", server["log_port"], pipeline.feed
+            )
+
+        # Only once the socket is bound, so a failed bind leaves no delivery
+        # task behind; lines received meanwhile wait in the queue.
+        outbox.start()
+        self.pipelines[server_name] = pipeline
 
         return True
 
 
     async def stop_server_monitoring(self, server_name: str) -> bool:
-        if server_name in self.server_tasks:
-            task = self.server_tasks.pop(server_name)
-            task.cancel()
+        if server_name in self.server_transports:
+            transport = self.server_transports.pop(server_name)
+            transport.close()
+            logger.info("Socket closed!")
+
+        if server_name in self.server_ports:
+            self.listener.remove_route("127.0.0.1", self.server_ports.pop(server_name))
 
-        if server_name in self.server_sockets:
-            sock = self.server_sockets.pop(server_name)
-            await sock.close()
+        if server_name in self.pipelines:
+            pipeline = self.pipelines.pop(server_name)
+            await pipeline.outbox.close()
 
         return True
 
 
-    async def restart_monitoring(self, servers: Optional[List[Dict]] = None):
-        from .database.servers import get_servers
-        if servers is None:
-            servers = await get_servers(active_only=True)
+    async def on_server_changed(self, old: Optional[Dict], new: Optional[Dict]):
+        """Applies one changed server row without touching the other servers."""
+        async with self.server_lock((new or old)["server_name"]):
+            await self.apply_server_change(old, new)
+
+
+    async def apply_server_change(self, old: Optional[Dict], new: Optional[Dict]):
+        server_name = (new or old)["server_name"]
+        monitored = server_name in self.pipelines
+        active = new is not None and bool(new["is_active"])
+
+        if old is not None and (new is None or new["port"] != old["port"]):
+            udp_pool.close("127.0.0.1", old["port"])
+
+        if not active:
+            if monitored:
+                await self.stop_server_monitoring(server_name)
+                logger.info(f"[{server_name}] Monitoring stopped")
+            return
+
+        if not monitored:
+            await self.start_server_monitoring(new)
+            logger.info(f"[{server_name}] Monitoring started")
+            return
+
+        pipeline = self.pipelines[server_name]
+
+        if self.listener is None and new["log_port"] != old["log_port"]:
+            await self.start_server_monitoring(new)
+            logger.info(f"[{server_name}] Log socket rebound to port {new['log_port']}")
+            return
 
-        for name in list(self.server_tasks.keys()):
-            await self.stop_server_monitoring(name)
+        if self.listener is not None and new["port"] != old["port"]:
+            self.listener.remove_route("127.0.0.1", old["port"])
+            self.listener.add_route("127.0.0.1", new["port"], pipeline)
+            self.server_ports[server_name] = new["port"]
 
-        started_count = 0
-        for server in servers:
-            if await self.start_server_monitoring(server):
-                started_count += 1
+        if new["protocol"] != old["protocol"] or new["log_events"] != old["log_events"]:
+            pipeline.configure(new["protocol"], parse_events(new["log_events"]))
 
-        all_servers = await get_servers(active_only=False)
-        stopped_count = len(all_servers) - started_count
+        if new["topic_id"] != old["topic_id"]:
+            pipeline.outbox.topic_id = new["topic_id"]
+            pipeline.outbox.detach()
 
-        return stopped_count, started_count
+        logger.info(f"[{server_name}] Monitoring updated")
 
 
     async def stop(self):
-        for name in list(self.server_tasks.keys()):
-            await self.stop_server_monitoring(name)
+        from .database.servers import remove_listener
+        from .database.chats import known_chats
+        from .database.chat_history import chat_history
+        from .database.user_names import name_cache
+        remove_listener(self.on_server_changed)
+        logger.info(f"User name cache: {name_cache.hits} hits, {name_cache.misses} misses")
+
+        # Every outbox flushes its last lines at the same time, so shutdown
+        # waits for the slowest one rather than for all of them in turn.
+        await asyncio.gather(*(self.stop_server_monitoring(name) for name in list(self.pipelines)))
+        if self.listener is not None:
+            self.listener.close()
         await super().stop()
+        await known_chats.close()
+        await chat_history.close()
+        self.scheduler.close()
+        udp_pool.close_all()
         logger.warning("HLBridge stopped!")
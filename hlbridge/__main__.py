@@ -46,43 +46,12 @@ except ImportError:
         logger.warning("uvloop is not installed and therefore will be disabled.")
 
 
-async def monitor_config_changes(hlbridge: HLBridge, interval: int = 1):
-    last_config_hash = None
-
-    while True:
-        try:
-            from .database.servers import get_servers
-            servers = await get_servers(active_only=True)
-
-            config_hash = hash(str(sorted([tuple(s.items()) for s in servers])))
-
-            if last_config_hash is None:
-                last_config_hash = config_hash
-            elif config_hash != last_config_hash:
-                logger.info("Server configuration changed. Reloading...")
-                stopped, started = await hlbridge.restart_monitoring(servers)
-                logger.info(f"Updated server monitoring: {started} servers started, {stopped} stopped")
-                last_config_hash = config_hash
-
-        except Exception as e:
-            logger.error(f"Error monitoring config changes: {e}")
-
-        await asyncio.sleep(interval)
-
-
 async def start_bot():
     hlbridge = HLBridge()
     try:
-        await database.connect()
-
-        from .database.servers import get_servers
-        servers = await get_servers(active_only=True)
-
+        # Connects the database as well, in parallel with the login
         await hlbridge.start()
 
-        logger.info(f"Starting monitoring for {len(servers)} active servers...")
-        asyncio.create_task(monitor_config_changes(hlbridge))
-
         await idle()
 
     except KeyboardInterrupt:
@@ -13,3 +13,48 @@ API_ID = int(config["api_id"])
 API_HASH = config["api_hash"]
 BOT_TOKEN = config["bot_token"]
 WORKERS = int(config["workers"])
+
+# Game chat is merged into one Telegram message per topic for this many
+# seconds or up to this many characters. 0 sends every line on its own.
+COALESCE_WINDOW = float(config.get("coalesce_window", 1.0))
+COALESCE_MAX_CHARS = min(int(config.get("coalesce_max_chars", 4096)), 4096)
+COALESCE_EDIT = bool(config.get("coalesce_edit", False))
+
+# Lines waiting for delivery per server. When Telegram falls behind the
+# overflow policy (drop_oldest, drop_newest or summarize) decides what is lost.
+QUEUE_SIZE = int(config.get("queue_size", 1000))
+QUEUE_OVERFLOW = config.get("queue_overflow", "drop_oldest")
+
+# When set, every server sends its logs to this single port and the bridge
+# routes them by source address instead of binding each server's log_port.
+LOG_LISTENER_PORT = int(config["log_listener_port"]) if config.get("log_listener_port") else None
+
+# Messages per minute to one group chat and messages per second overall.
+# Every message the bridge sends is paced to stay under these limits.
+CHAT_RATE_LIMIT = float(config.get("chat_rate_limit", 20))
+GLOBAL_RATE_LIMIT = float(config.get("global_rate_limit", 30))
+
+# Seconds a chat member's admin status is trusted before asking Telegram
+# again. With member_cache_persist it is also kept across restarts.
+MEMBER_CACHE_TTL = float(config.get("member_cache_ttl", 300))
+MEMBER_CACHE_PERSIST = bool(config.get("member_cache_persist", False))
+
+# Seconds a server status shown by /status is reused before querying again.
+STATUS_CACHE_TTL = float(config.get("status_cache_ttl", 5))
+
+# Servers /rcon_all talks to at the same time.
+RCON_BROADCAST_LIMIT = int(config.get("rcon_broadcast_limit", 10))
+
+# Database writes are committed together, this many milliseconds after the
+# first one or as soon as this many are waiting.
+DB_COMMIT_INTERVAL = float(config.get("db_commit_interval_ms", 50)) / 1000
+DB_COMMIT_BATCH = int(config.get("db_commit_batch", 100))
+
+# Seconds between database maintenance runs (incremental vacuum, planner
+# statistics and WAL checkpoint).
+DB_MAINTENANCE_INTERVAL = float(config.get("db_maintenance_interval", 3600))
+
+# say and say_team lines of every server are archived for /history and
+# deleted after this many days (0 keeps them forever).
+CHAT_HISTORY = bool(config.get("chat_history", True))
+CHAT_HISTORY_DAYS = float(config.get("chat_history_days", 30))
@@ -2,22 +2,21 @@
 # Copyright (c) 2025 Elinsrc
 
 from .core import database
-
-conn = database.get_conn()
+from .roles import roles
 
 
 async def add_to_admin(user_id: int):
-    await conn.execute('INSERT INTO admins (user_id) VALUES (?)', (user_id,))
-    await conn.commit()
+    await roles.ensure_loaded()
+    await database.write('INSERT OR IGNORE INTO admins (user_id) VALUES (?)', (user_id,), durable=True)
+    roles.admins.add(user_id)
 
 
 async def remove_from_admin(user_id: int):
-    await conn.execute('DELETE FROM adminsWHERE user_id = ?', (user_id,))
-    await conn.commit()
+    await roles.ensure_loaded()
+    await database.write('DELETE FROM admins WHERE user_id = ?', (user_id,), durable=True)
+    roles.admins.discard(user_id)
 
 
 async def user_admin(user_id: int) -> bool:
-    cursor = await conn.execute('SELECT user_id FROM admins WHERE user_id = ?', (user_id,))
-    row = await cursor.fetchone()
-    await cursor.close()
-    return row is not None
+    await roles.ensure_loaded()
+    return user_id in roles.admins
@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+from typing import Any, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from .core import database
+
+
+class BatchWriter:
+    """Buffers the rows of one statement and writes them with a single executemany.
+
+    A batch is written ``delay`` seconds after its first row or as soon as
+    ``batch_size`` rows are waiting. Committing is left to the database
+    group commit.
+    """
+
+    def __init__(self, sql: str, what: str, delay: float = 1.0, batch_size: int = 100):
+        self.sql = sql
+        self.what = what
+        self.delay = delay
+        self.batch_size = batch_size
+        self.pending: List[Tuple[Any, ...]] = []
+        self.task: Optional[asyncio.Task] = None
+        # asyncio keeps only weak references to tasks
+        self.flush_tasks: Set[asyncio.Task] = set()
+
+    def add(self, row: Tuple[Any, ...]):
+        self.pending.append(row)
+
+        if len(self.pending) == self.batch_size:
+            task = asyncio.create_task(self.flush())
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+        elif self.task is None:
+            self.task = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.delay)
+        self.task = None
+        await self.flush()
+
+    async def flush(self):
+        """Writes the rows added since the last flush."""
+        if not self.pending:
+            return
+
+        pending, self.pending = self.pending, []
+
+        try:
+            await database.write_many(self.sql, pending)
+        except Exception as e:
+            logger.error(f"Failed to store {len(pending)} {self.what}: {e}")
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
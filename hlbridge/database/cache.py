@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+NOT_CACHED = object()
+
+
+class LRUCache:
+    """A bounded mapping that evicts the least recently used key.
+
+    ``get`` returns NOT_CACHED for unknown keys so that None can be cached
+    for rows that do not exist or columns that are not set.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.items: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, key: Hashable) -> Any:
+        if key not in self.items:
+            self.misses += 1
+            return NOT_CACHED
+
+        self.hits += 1
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key: Hashable, value: Any):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.size:
+            self.items.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self.items.pop(key, None)
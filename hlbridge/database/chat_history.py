@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import time
+from typing import List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from hlbridge.config import CHAT_HISTORY_DAYS
+from hlbridge.database import database
+from hlbridge.database.batch import BatchWriter
+
+conn = database.get_conn()
+
+# time, server_name, player, steam_id, team, message
+ChatLine = Tuple[float, str, str, Optional[str], int, str]
+
+
+class ChatHistory:
+    """Archive of the say and say_team lines of every server.
+
+    Lines are inserted in batches by a BatchWriter. Lines older than
+    ``days`` are deleted by the database maintenance.
+    """
+
+    def __init__(self, days: float = CHAT_HISTORY_DAYS, delay: float = 1.0, batch_size: int = 500):
+        self.days = days
+        self.writer = BatchWriter(
+            "INSERT INTO chat_history (time, server_name, player, steam_id, team, message) VALUES (?, ?, ?, ?, ?, ?)",
+            "chat lines",
+            delay,
+            batch_size,
+        )
+
+    def add(self, server_name: str, event):
+        player = event.player
+        line: ChatLine = (
+            time.time(), server_name, player.name, player.steam_id, int(event.type == "say_team"), event.text
+        )
+        self.writer.add(line)
+
+    async def flush(self):
+        await self.writer.flush()
+
+    async def prune(self, chunk: int = 5000):
+        """Deletes the lines older than the retention window.
+
+        Rows are deleted and committed in chunks, so other queries on the
+        connection are not held up by a large backlog.
+        """
+        if not self.days:
+            return
+
+        cutoff = time.time() - self.days * 86400
+        deleted = 0
+        while True:
+            cursor = await conn.execute(
+                "DELETE FROM chat_history WHERE id IN "
+                "(SELECT id FROM chat_history WHERE time < ? ORDER BY time LIMIT ?)",
+                (cutoff, chunk),
+            )
+            removed = cursor.rowcount
+            await cursor.close()
+            await database.queue_commit(durable=False)
+            await database.commit()
+
+            deleted += removed
+            if removed < chunk:
+                break
+
+        if deleted:
+            logger.info(f"Deleted {deleted} chat lines older than {self.days:g} days")
+
+    async def close(self):
+        await self.writer.close()
+
+
+chat_history = ChatHistory()
+database.maintenance_jobs.append(chat_history.prune)
+
+
+def match_words(text: str) -> str:
+    """Turns free text into an FTS5 query matching every word as a prefix."""
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+
+
+async def search_chat_history(
+    text: Optional[str] = None,
+    player: Optional[str] = None,
+    server_name: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 50,
+) -> List[aiosqlite.Row]:
+    """Returns the newest matching lines first.
+
+    ``text`` and ``player`` match words of the message and of the player
+    name through the full-text index; a ``player`` starting with STEAM_
+    or VALVE_ matches the Steam ID instead. ``since`` and ``until`` are
+    Unix timestamps.
+    """
+    await chat_history.flush()
+
+    terms = []
+    conditions = []
+    params: list = []
+
+    if text and text.split():
+        terms.append(f"message : ({match_words(text)})")
+    if player:
+        if player.upper().startswith(("STEAM_", "VALVE_")):
+            conditions.append("h.steam_id = ?")
+            params.append(player.upper())
+        elif player.split():
+            terms.append(f"player : ({match_words(player)})")
+    if server_name:
+        conditions.append("h.server_name = ?")
+        params.append(server_name)
+    if since is not None:
+        conditions.append("h.time >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("h.time < ?")
+        params.append(until)
+
+    columns = "h.time, h.server_name, h.player, h.steam_id, h.team, h.message"
+
+    if terms:
+        # Rows are inserted in time order, so the time range is also a range
+        # of ids, which the index walks directly instead of every match.
+        if since is not None:
+            conditions.append("f.rowid >= (SELECT id FROM chat_history WHERE time >= ? ORDER BY time LIMIT 1)")
+            params.append(since)
+        if until is not None:
+            conditions.append("f.rowid <= (SELECT id FROM chat_history WHERE time < ? ORDER BY time DESC LIMIT 1)")
+            params.append(until)
+
+        sql = (
+            f"SELECT {columns} FROM chat_history_fts f JOIN chat_history h ON h.id = f.rowid "
+            f"WHERE chat_history_fts MATCH ?{''.join(' AND ' + c for c in conditions)} "
+            "ORDER BY f.rowid DESC LIMIT ?"
+        )
+        params = [" AND ".join(terms), *params, limit]
+    else:
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        sql = f"SELECT {columns} FROM chat_history h {where}ORDER BY h.time DESC LIMIT ?"
+        params.append(limit)
+
+    cursor = await conn.execute(sql, params)
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return rows
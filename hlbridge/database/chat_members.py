@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+from hydrogram.enums import ChatMemberStatus
+from hydrogram.types import Chat, ChatPrivileges
+
+from hlbridge.config import MEMBER_CACHE_TTL, MEMBER_CACHE_PERSIST
+
+from .core import database
+
+conn = database.get_conn()
+
+
+class CachedMember:
+    __slots__ = ("status", "privileges", "expires")
+
+    def __init__(self, status: ChatMemberStatus, privileges: Optional[ChatPrivileges], expires: float):
+        self.status = status
+        self.privileges = privileges
+        self.expires = expires
+
+
+class MemberCache:
+    """Status and privileges of chat members, as used by check_perms.
+
+    Entries expire after ``ttl`` seconds and are dropped as soon as Telegram
+    reports a change of the member. With ``persist`` enabled they are also
+    stored in the chat_members table so they survive a restart.
+    """
+
+    def __init__(self, ttl: float, persist: bool = False, size: int = 10000):
+        self.ttl = ttl
+        self.persist = persist
+        self.size = size
+        self.members: Dict[Tuple[int, int], CachedMember] = {}
+
+    async def get(self, chat: Chat, user_id: int) -> CachedMember:
+        key = (chat.id, user_id)
+        now = time.time()
+
+        member = self.members.get(key)
+        if member is not None and member.expires > now:
+            return member
+
+        if self.persist:
+            member = await self.load(key)
+            if member is not None and member.expires > now:
+                self.members[key] = member
+                return member
+
+        chat_member = await chat.get_member(user_id)
+        member = CachedMember(chat_member.status, chat_member.privileges, now + self.ttl)
+        self.put(key, member, now)
+        if self.persist:
+            await self.save(key, member)
+        return member
+
+    def put(self, key: Tuple[int, int], member: CachedMember, now: float):
+        if len(self.members) >= self.size:
+            self.members = {k: v for k, v in self.members.items() if v.expires > now}
+            if len(self.members) >= self.size:
+                self.members.pop(next(iter(self.members)))
+        self.members[key] = member
+
+    async def invalidate(self, chat_id: int, user_id: int):
+        self.members.pop((chat_id, user_id), None)
+        if self.persist:
+            await database.write(
+                "DELETE FROM chat_members WHERE chat_id = ? AND user_id = ?", (chat_id, user_id)
+            )
+
+    async def load(self, key: Tuple[int, int]) -> Optional[CachedMember]:
+        cursor = await conn.execute(
+            "SELECT status, privileges, expires FROM chat_members WHERE chat_id = ? AND user_id = ?", key
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        if row is None:
+            return None
+
+        privileges = ChatPrivileges(**json.loads(row["privileges"])) if row["privileges"] else None
+        return CachedMember(ChatMemberStatus(row["status"]), privileges, row["expires"])
+
+    async def save(self, key: Tuple[int, int], member: CachedMember):
+        privileges = None
+        if member.privileges is not None:
+            privileges = json.dumps({
+                k: v for k, v in member.privileges.__dict__.items() if not k.startswith("_")
+            })
+
+        await database.write(
+            """
+            INSERT INTO chat_members (chat_id, user_id, status, privileges, expires)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(chat_id, user_id) DO UPDATE SET
+                status = excluded.status,
+                privileges = excluded.privileges,
+                expires = excluded.expires
+            """,
+            (*key, member.status.value, privileges, member.expires),
+        )
+
+
+member_cache = MemberCache(MEMBER_CACHE_TTL, MEMBER_CACHE_PERSIST)
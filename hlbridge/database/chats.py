@@ -1,40 +1,93 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2018-2024 Amano LLC
 
+from typing import Dict, Set, Tuple
+
 from hydrogram.enums import ChatType
+from loguru import logger
 
 from hlbridge.database import database
+from hlbridge.database.batch import BatchWriter
 from hlbridge.utils.consts import GROUP_TYPES
 
 conn = database.get_conn()
 
+# Table and key column of each kind of chat
+CHAT_TABLES: Dict[str, str] = {
+    "users": "user_id",
+    "groups": "chat_id",
+    "channels": "chat_id",
+}
 
-async def add_chat(chat_id, chat_type):
-    if chat_type == ChatType.PRIVATE:
-        await conn.execute("INSERT INTO users (user_id) values (?)", (chat_id,))
-        await conn.commit()
-    elif chat_type in GROUP_TYPES:  # groups and supergroups share the same table
-        await conn.execute("INSERT INTO groups (chat_id) values (?)", (chat_id,))
-        await conn.commit()
-    elif chat_type == ChatType.CHANNEL:
-        await conn.execute("INSERT INTO channels (chat_id) values (?)", (chat_id,))
-        await conn.commit()
-    else:
-        raise TypeError(f"Unknown chat type '{chat_type}'.")
-    return True
 
-
-async def chat_exists(chat_id, chat_type):
+def chat_table(chat_type) -> str:
     if chat_type == ChatType.PRIVATE:
-        cursor = await conn.execute("SELECT user_id FROM users where user_id = ?", (chat_id,))
-        row = await cursor.fetchone()
-        return bool(row)
+        return "users"
     if chat_type in GROUP_TYPES:  # groups and supergroups share the same table
-        cursor = await conn.execute("SELECT chat_id FROM groups where chat_id = ?", (chat_id,))
-        row = await cursor.fetchone()
-        return bool(row)
+        return "groups"
     if chat_type == ChatType.CHANNEL:
-        cursor = await conn.execute("SELECT chat_id FROM channels where chat_id = ?", (chat_id,))
-        row = await cursor.fetchone()
-        return bool(row)
+        return "channels"
     raise TypeError(f"Unknown chat type '{chat_type}'.")
+
+
+class KnownChats:
+    """Every chat stored in the users, groups and channels tables.
+
+    It is loaded once, so checking a chat is a set lookup. New chats are
+    remembered right away and written with INSERT OR IGNORE in batches,
+    either ``delay`` seconds after the first one or once ``batch_size``
+    are waiting.
+    """
+
+    def __init__(self, delay: float = 1.0, batch_size: int = 100):
+        self.loaded = False
+        self.chats: Set[Tuple[str, int]] = set()
+        self.writers: Dict[str, BatchWriter] = {
+            table: BatchWriter(
+                f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", f"new {table}", delay, batch_size
+            )
+            for table, column in CHAT_TABLES.items()
+        }
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+
+        for table, column in CHAT_TABLES.items():
+            cursor = await conn.execute(f"SELECT {column} FROM {table}")
+            rows = await cursor.fetchall()
+            await cursor.close()
+            self.chats.update((table, row[0]) for row in rows)
+
+        self.loaded = True
+        logger.info(f"Loaded {len(self.chats)} known chats")
+
+    def add(self, table: str, chat_id: int):
+        if (table, chat_id) in self.chats:
+            return
+
+        self.chats.add((table, chat_id))
+        self.writers[table].add((chat_id,))
+
+    async def flush(self):
+        """Writes the chats added since the last flush."""
+        for writer in self.writers.values():
+            await writer.flush()
+
+    async def close(self):
+        for writer in self.writers.values():
+            await writer.close()
+
+
+known_chats = KnownChats()
+
+
+async def add_chat(chat_id, chat_type):
+    await known_chats.ensure_loaded()
+    known_chats.add(chat_table(chat_type), chat_id)
+    return True
+
+
+async def chat_exists(chat_id, chat_type):
+    await known_chats.ensure_loaded()
+    return (chat_table(chat_type), chat_id) in known_chats.chats
@@ -2,69 +2,57 @@
 # Copyright (c) 2018-2024 Amano LLC
 # Copyright (c) 2025 Elinsrc
 
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set
+
 from loguru import logger
 
 import aiosqlite
 
+from hlbridge.config import DB_COMMIT_INTERVAL, DB_COMMIT_BATCH, DB_MAINTENANCE_INTERVAL
+
+from .maintenance import enable_incremental_vacuum, run_maintenance
+from .migrations import migrate
+
 
 class Database:
-    def __init__(self):
+    def __init__(
+        self,
+        commit_interval: float = DB_COMMIT_INTERVAL,
+        commit_batch: int = DB_COMMIT_BATCH,
+        maintenance_interval: float = DB_MAINTENANCE_INTERVAL,
+    ):
         self.conn: aiosqlite.Connection = None
         self.path: str = "hlbridge.db"
         self.is_connected: bool = False
 
+        # Writes are executed right away, so reads on this connection see
+        # them, but committed in groups: commit_interval seconds after the
+        # first pending write or once commit_batch writes are pending.
+        self.commit_interval = commit_interval
+        self.commit_batch = commit_batch
+        self.pending_writes = 0
+        self.committed: Optional[asyncio.Future] = None
+        self.commit_task: Optional[asyncio.Task] = None
+        # asyncio keeps only weak references to tasks, the commits started
+        # for a full batch are held here until they finish
+        self.commit_tasks: Set[asyncio.Task] = set()
+
+        # Vacuum, statistics and WAL checkpoints run in the background
+        self.maintenance_interval = maintenance_interval
+        self.maintenance_task: Optional[asyncio.Task] = None
+        self.maintenance_jobs: List[Callable[[], Awaitable[None]]] = []
+        self.full_vacuum = False
+
     async def connect(self):
         # Open the connection
         conn = await aiosqlite.connect(self.path)
 
-        # Define the tables
-        await conn.executescript(
-            """
-        CREATE TABLE IF NOT EXISTS groups(
-            chat_id INTEGER PRIMARY KEY,
-            chat_lang TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS users(
-            user_id INTEGER PRIMARY KEY,
-            chat_lang TEXT
-        );
-
-        CREATE TABLE IF NOT EXISTS channels(
-            chat_id INTEGER PRIMARY KEY
-        );
-
-        CREATE TABLE IF NOT EXISTS servers(
-            server_name TEXT,
-            port INTEGER,
-            log_port INTEGER,
-            protocol INTEGER,
-            topic_id INTEGER,
-            connectionless_args TEXT,
-            rcon_password TEXT,
-            is_active INTEGER DEFAULT 1
-        );
-
-        CREATE TABLE IF NOT EXISTS bot_settings(
-            owner_id INTEGER PRIMARY KEY,
-            chat_id INTEGER,
-            topic_id INTEGER
-        );
-
-        CREATE TABLE IF NOT EXISTS admins(
-            user_id INTEGER
-        );
-
-        CREATE TABLE IF NOT EXISTS user_names(
-            user_id INTEGER PRIMARY KEY,
-            default_name TEXT,
-            custom_name TEXT
-        );
-        """
-        )
+        # Must be set before the first table is created to apply without a VACUUM
+        self.full_vacuum = await enable_incremental_vacuum(conn)
 
-        # Enable VACUUM
-        await conn.execute("VACUUM")
+        # Create or upgrade the tables
+        await migrate(conn)
 
         # Enable WAL
         await conn.execute("PRAGMA journal_mode=WAL")
@@ -77,9 +65,86 @@ class Database:
         self.conn = conn
         self.is_connected: bool = True
 
+        self.maintenance_task = asyncio.create_task(self.maintain())
+
         logger.info("The database has been connected.")
 
+    async def write(self, sql: str, params: Iterable[Any] = (), durable: bool = False):
+        """Executes a write statement and queues it for the next group commit.
+
+        With ``durable`` the call returns only once the write is committed.
+        """
+        await self.conn.execute(sql, params)
+        await self.queue_commit(durable)
+
+    async def write_many(self, sql: str, params: Iterable[Iterable[Any]], durable: bool = False):
+        await self.conn.executemany(sql, params)
+        await self.queue_commit(durable)
+
+    async def queue_commit(self, durable: bool):
+        if self.committed is None:
+            self.committed = asyncio.get_running_loop().create_future()
+            # Nobody may be waiting for it, so never leave its error unretrieved
+            self.committed.add_done_callback(lambda f: f.cancelled() or f.exception())
+        committed = self.committed
+
+        self.pending_writes += 1
+        if self.pending_writes >= self.commit_batch:
+            task = asyncio.create_task(self.commit())
+            self.commit_tasks.add(task)
+            task.add_done_callback(self.commit_tasks.discard)
+        elif self.commit_task is None:
+            self.commit_task = asyncio.create_task(self.commit_later())
+
+        if durable:
+            await asyncio.shield(committed)
+
+    async def commit_later(self):
+        await asyncio.sleep(self.commit_interval)
+        self.commit_task = None
+        await self.commit()
+
+    async def commit(self):
+        """Commits every pending write now."""
+        committed, self.committed = self.committed, None
+        self.pending_writes = 0
+        if committed is None:
+            return
+
+        try:
+            await self.conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit the database: {e}")
+            committed.set_exception(e)
+        else:
+            committed.set_result(None)
+
+    async def maintain(self):
+        """Runs the database maintenance every maintenance_interval seconds."""
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            # Jobs such as expiring old rows run first, so their pages are reclaimed
+            for job in self.maintenance_jobs:
+                try:
+                    await job()
+                except Exception as e:
+                    logger.error(f"Database maintenance job {job.__qualname__} failed: {e}")
+            try:
+                await self.commit()
+                await run_maintenance(self.conn, self.path, self.full_vacuum)
+                self.full_vacuum = False
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+
     async def close(self):
+        if self.maintenance_task is not None:
+            self.maintenance_task.cancel()
+            self.maintenance_task = None
+        if self.commit_task is not None:
+            self.commit_task.cancel()
+            self.commit_task = None
+        await self.commit()
+
         # Close the connection
         await self.conn.close()
 
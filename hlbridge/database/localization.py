@@ -5,42 +5,62 @@ from hydrogram.enums import ChatType
 
 from hlbridge.utils.consts import GROUP_TYPES
 
+from .cache import LRUCache, NOT_CACHED
+from .chats import known_chats
 from .core import database
 
 conn = database.get_conn()
 
+# Stored language of recently used chats, keyed by (chat_type table, chat_id)
+lang_cache = LRUCache(5000)
+
 
 async def set_db_lang(chat_id: int, chat_type: str, lang_code: str):
+    # The chat row may still be waiting to be inserted
+    await known_chats.flush()
+
     if chat_type in {ChatType.PRIVATE, ChatType.BOT}:
-        await conn.execute(
+        await database.write(
             "UPDATE users SET chat_lang = ? WHERE user_id = ?", (lang_code, chat_id)
         )
-        await conn.commit()
+        table = "users"
     elif chat_type in GROUP_TYPES:  # groups and supergroups share the same table
-        await conn.execute(
+        await database.write(
             "UPDATE groups SET chat_lang = ? WHERE chat_id = ?", (lang_code, chat_id)
         )
-        await conn.commit()
+        table = "groups"
     elif chat_type == ChatType.CHANNEL:
-        await conn.execute(
+        await database.write(
             "UPDATE channels SET chat_lang = ? WHERE chat_id = ?", (lang_code, chat_id)
         )
-        await conn.commit()
+        table = "channels"
     else:
         raise TypeError(f"Unknown chat type '{chat_type}'.")
 
+    lang_cache.pop((table, chat_id))
+
 
 async def get_db_lang(chat_id: int, chat_type: ChatType) -> str:
     if chat_type == ChatType.PRIVATE:
-        cursor = await conn.execute("SELECT chat_lang FROM users WHERE user_id = ?", (chat_id,))
-        ul = await cursor.fetchone()
+        key = ("users", chat_id)
+        query = "SELECT chat_lang FROM users WHERE user_id = ?"
     elif chat_type in GROUP_TYPES:  # groups and supergroups share the same table
-        cursor = await conn.execute("SELECT chat_lang FROM groups WHERE chat_id = ?", (chat_id,))
-        ul = await cursor.fetchone()
+        key = ("groups", chat_id)
+        query = "SELECT chat_lang FROM groups WHERE chat_id = ?"
     elif chat_type == ChatType.CHANNEL:
-        cursor = await conn.execute("SELECT chat_lang FROM channels WHERE chat_id = ?", (chat_id,))
-        ul = await cursor.fetchone()
+        key = ("channels", chat_id)
+        query = "SELECT chat_lang FROM channels WHERE chat_id = ?"
     else:
         raise TypeError(f"Unknown chat type '{chat_type}'.")
 
-    return ul[0] if ul else None
+    lang = lang_cache.get(key)
+    if lang is not NOT_CACHED:
+        return lang
+
+    cursor = await conn.execute(query, (chat_id,))
+    ul = await cursor.fetchone()
+    await cursor.close()
+
+    lang = ul[0] if ul else None
+    lang_cache.put(key, lang)
+    return lang
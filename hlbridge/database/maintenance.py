@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import os
+import time
+
+from loguru import logger
+
+import aiosqlite
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+async def pragma(conn: aiosqlite.Connection, statement: str):
+    cursor = await conn.execute(f"PRAGMA {statement}")
+    row = await cursor.fetchone()
+    await cursor.close()
+    return row[0] if row else None
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+async def enable_incremental_vacuum(conn: aiosqlite.Connection) -> bool:
+    """Switches the database to incremental auto_vacuum.
+
+    A new database switches right away. An existing one needs a single full
+    VACUUM, which then runs in the first maintenance instead of at startup.
+    Returns whether that VACUUM is still needed.
+    """
+    if await pragma(conn, "auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+        return False
+    await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    return await pragma(conn, "auto_vacuum") != AUTO_VACUUM_INCREMENTAL
+
+
+async def run_maintenance(conn: aiosqlite.Connection, path: str, full_vacuum: bool = False):
+    """Returns free pages to the filesystem, refreshes the query planner statistics and checkpoints the WAL."""
+    start = time.monotonic()
+    wal_path = f"{path}-wal"
+    page_size = await pragma(conn, "page_size")
+    pages_before = await pragma(conn, "page_count")
+    wal_before = file_size(wal_path)
+
+    # executescript commits an open transaction and runs the whole script in
+    # one call on the connection thread, so no group-commit write can start
+    # a new transaction in between. It also steps incremental_vacuum to
+    # completion, while execute() would free only a single page.
+    if full_vacuum:
+        await conn.executescript("VACUUM;")
+        logger.info("Database switched to incremental auto_vacuum")
+    else:
+        free_pages = await pragma(conn, "freelist_count")
+        if free_pages:
+            await conn.executescript("PRAGMA incremental_vacuum;")
+
+    pages_freed = pages_before - await pragma(conn, "page_count")
+
+    # A checkpoint inside an open write transaction fails as locked
+    await conn.executescript("PRAGMA optimize; PRAGMA wal_checkpoint(TRUNCATE);")
+
+    wal_shrunk = wal_before - file_size(wal_path)
+    logger.info(
+        f"Database maintenance done in {(time.monotonic() - start) * 1000:.0f} ms, "
+        f"{max(pages_freed, 0)} pages ({max(pages_freed, 0) * page_size / 1024:.1f} KiB) freed, "
+        f"WAL shrunk by {max(wal_shrunk, 0) / 1024:.1f} KiB"
+    )
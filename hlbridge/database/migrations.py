@@ -0,0 +1,208 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from typing import Awaitable, Callable, List, Tuple
+
+from loguru import logger
+
+import aiosqlite
+
+Migration = Callable[[aiosqlite.Connection], Awaitable[None]]
+
+
+async def create_tables(conn: aiosqlite.Connection):
+    """The schema before migrations were tracked. Existing tables are kept as they are."""
+    for statement in (
+        """
+        CREATE TABLE IF NOT EXISTS groups(
+            chat_id INTEGER PRIMARY KEY,
+            chat_lang TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS users(
+            user_id INTEGER PRIMARY KEY,
+            chat_lang TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS channels(
+            chat_id INTEGER PRIMARY KEY,
+            chat_lang TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS servers(
+            server_name TEXT,
+            port INTEGER,
+            log_port INTEGER,
+            protocol INTEGER,
+            topic_id INTEGER,
+            connectionless_args TEXT,
+            rcon_password TEXT,
+            is_active INTEGER DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS bot_settings(
+            owner_id INTEGER PRIMARY KEY,
+            chat_id INTEGER,
+            topic_id INTEGER
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS admins(
+            user_id INTEGER
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_names(
+            user_id INTEGER PRIMARY KEY,
+            default_name TEXT,
+            custom_name TEXT
+        )
+        """,
+    ):
+        await conn.execute(statement)
+
+
+async def add_columns(conn: aiosqlite.Connection):
+    """Per-server log events and tags, and the channel language. Databases of earlier builds may have them already."""
+    for table, names in (("servers", ("log_events", "tags")), ("channels", ("chat_lang",))):
+        cursor = await conn.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        await cursor.close()
+
+        for name in names:
+            if name not in existing:
+                await conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} TEXT")
+
+
+async def create_chat_members(conn: aiosqlite.Connection):
+    """Member rights cached by check_perms."""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chat_members(
+            chat_id INTEGER,
+            user_id INTEGER,
+            status TEXT,
+            privileges TEXT,
+            expires REAL,
+            PRIMARY KEY (chat_id, user_id)
+        )
+        """
+    )
+
+
+async def add_keys(conn: aiosqlite.Connection):
+    """Unique server names and admins.
+
+    Both tables are rebuilt; duplicate rows keep the first one inserted.
+    """
+    await conn.execute(
+        """
+        CREATE TABLE servers_new(
+            server_name TEXT PRIMARY KEY,
+            port INTEGER,
+            log_port INTEGER,
+            protocol INTEGER,
+            topic_id INTEGER,
+            connectionless_args TEXT,
+            rcon_password TEXT,
+            is_active INTEGER DEFAULT 1,
+            log_events TEXT,
+            tags TEXT
+        )
+        """
+    )
+    await conn.execute(
+        """
+        INSERT OR IGNORE INTO servers_new
+        SELECT server_name, port, log_port, protocol, topic_id,
+               connectionless_args, rcon_password, is_active, log_events, tags
+        FROM servers WHERE server_name IS NOT NULL ORDER BY rowid
+        """
+    )
+    await conn.execute("DROP TABLE servers")
+    await conn.execute("ALTER TABLE servers_new RENAME TO servers")
+
+    await conn.execute("CREATE TABLE admins_new(user_id INTEGER PRIMARY KEY)")
+    await conn.execute(
+        "INSERT OR IGNORE INTO admins_new SELECT user_id FROM admins WHERE user_id IS NOT NULL"
+    )
+    await conn.execute("DROP TABLE admins")
+    await conn.execute("ALTER TABLE admins_new RENAME TO admins")
+
+
+async def create_chat_history(conn: aiosqlite.Connection):
+    """Game chat archive with a full-text index kept in sync by triggers."""
+    for statement in (
+        """
+        CREATE TABLE chat_history(
+            id INTEGER PRIMARY KEY,
+            time REAL NOT NULL,
+            server_name TEXT NOT NULL,
+            player TEXT NOT NULL,
+            steam_id TEXT,
+            team INTEGER NOT NULL DEFAULT 0,
+            message TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX chat_history_time ON chat_history(time)",
+        "CREATE INDEX chat_history_server_time ON chat_history(server_name, time)",
+        "CREATE INDEX chat_history_steam_id_time ON chat_history(steam_id, time)",
+        """
+        CREATE VIRTUAL TABLE chat_history_fts USING fts5(
+            player, message,
+            content='chat_history', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER chat_history_insert AFTER INSERT ON chat_history BEGIN
+            INSERT INTO chat_history_fts(rowid, player, message)
+            VALUES (new.id, new.player, new.message);
+        END
+        """,
+        """
+        CREATE TRIGGER chat_history_delete AFTER DELETE ON chat_history BEGIN
+            INSERT INTO chat_history_fts(chat_history_fts, rowid, player, message)
+            VALUES ('delete', old.id, old.player, old.message);
+        END
+        """,
+    ):
+        await conn.execute(statement)
+
+
+# Applied in order; the schema version is the number of migrations applied.
+# Never edit or reorder a released migration, append a new one instead.
+MIGRATIONS: List[Tuple[str, Migration]] = [
+    ("create tables", create_tables),
+    ("add server log events and tags, channel language", add_columns),
+    ("create chat members", create_chat_members),
+    ("add keys", add_keys),
+    ("create chat history", create_chat_history),
+]
+
+
+async def migrate(conn: aiosqlite.Connection):
+    """Brings the database up to the latest schema version, one migration per transaction."""
+    cursor = await conn.execute("PRAGMA user_version")
+    version = (await cursor.fetchone())[0]
+    await cursor.close()
+
+    if version > len(MIGRATIONS):
+        raise RuntimeError(
+            f"The database schema version {version} is newer than this build supports ({len(MIGRATIONS)})."
+        )
+
+    for number, (description, migration) in enumerate(MIGRATIONS[version:], start=version + 1):
+        await conn.execute("BEGIN")
+        try:
+            await migration(conn)
+            await conn.execute(f"PRAGMA user_version = {number}")
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        logger.info(f"Database migrated to version {number}: {description}")
@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from typing import Optional, Set
+
+from .core import database
+
+conn = database.get_conn()
+
+
+class Roles:
+    """Owner and admins of the bot, checked by the permission decorators.
+
+    Loaded from bot_settings and admins on first use and kept current by
+    set_settings, add_to_admin and remove_from_admin, so a permission check
+    never queries the database.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.owner_id: Optional[int] = None
+        self.admins: Set[int] = set()
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+
+        cursor = await conn.execute("SELECT owner_id FROM bot_settings LIMIT 1")
+        row = await cursor.fetchone()
+        await cursor.close()
+        self.owner_id = row[0] if row else None
+
+        cursor = await conn.execute("SELECT user_id FROM admins")
+        rows = await cursor.fetchall()
+        await cursor.close()
+        self.admins = {row[0] for row in rows}
+
+        self.loaded = True
+
+
+roles = Roles()
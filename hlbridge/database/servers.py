@@ -1,13 +1,107 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Elinsrc
 
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from loguru import logger
+
 from .core import database
 
 conn = database.get_conn()
 
+
+class ServerRegistry:
+    """In-memory copy of the servers table, indexed the way servers are looked up.
+
+    It is loaded on first use and kept current by the write functions of
+    this module, so routing a message to a server is a dict lookup.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.by_name: Dict[str, Dict] = {}
+        self.by_topic: Dict[int, Dict] = {}
+        self.by_port: Dict[int, Dict] = {}
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+
+        cursor = await conn.execute("SELECT * FROM servers")
+        rows = await cursor.fetchall()
+        await cursor.close()
+
+        for row in rows:
+            self.put(dict(row))
+        self.loaded = True
+
+    def put(self, server: Dict):
+        self.remove(server["server_name"])
+        self.by_name[server["server_name"]] = server
+        self.by_topic[server["topic_id"]] = server
+        self.by_port[server["port"]] = server
+
+    def remove(self, server_name: str) -> Optional[Dict]:
+        server = self.by_name.pop(server_name, None)
+        if server is None:
+            return None
+
+        if self.by_topic.get(server["topic_id"]) is server:
+            del self.by_topic[server["topic_id"]]
+        if self.by_port.get(server["port"]) is server:
+            del self.by_port[server["port"]]
+        return server
+
+    async def refresh(self, server_name: str):
+        """Re-reads one server after it has been written and publishes the change.
+
+        Writers load the registry before writing so ``old`` is the previous row.
+        """
+        old = self.by_name.get(server_name)
+
+        cursor = await conn.execute(
+            "SELECT * FROM servers WHERE server_name = ?", (server_name,)
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+
+        new = dict(row) if row else None
+        if new:
+            self.put(new)
+        else:
+            self.remove(server_name)
+
+        if old != new:
+            await publish(old, new)
+
+
+registry = ServerRegistry()
+
+# Called with the old and the new row (None when added or removed) after each change
+ServerListener = Callable[[Optional[Dict], Optional[Dict]], Awaitable[None]]
+listeners: List[ServerListener] = []
+
+
+def add_listener(callback: ServerListener):
+    listeners.append(callback)
+
+
+def remove_listener(callback: ServerListener):
+    if callback in listeners:
+        listeners.remove(callback)
+
+
+async def publish(old: Optional[Dict], new: Optional[Dict]):
+    for callback in listeners:
+        try:
+            await callback(dict(old) if old else None, dict(new) if new else None)
+        except Exception as e:
+            logger.error(f"Error handling server change: {e}")
+
+
 async def add_server(server: Dict) -> None:
-    await conn.execute(
+    await registry.ensure_loaded()
+    await database.write(
         """
         INSERT INTO servers (
             server_name, port, log_port, protocol, topic_id,
@@ -22,9 +116,10 @@ async def add_server(server: Dict) -> None:
             server['topic_id'],
             server['connectionless_args'],
             server['rcon_password']
-        )
+        ),
+        durable=True
     )
-    await conn.commit()
+    await registry.refresh(server['server_name'])
 
 
 async def update_server(server_name: str, updates: Dict) -> None:
@@ -39,60 +134,78 @@ async def update_server(server_name: str, updates: Dict) -> None:
     if not set_clauses:
         return
 
+    await registry.ensure_loaded()
     params.append(server_name)
     query = f"UPDATE servers SET {', '.join(set_clauses)} WHERE server_name = ?"
-    await conn.execute(query, params)
-    await conn.commit()
+    await database.write(query, params, durable=True)
+    await registry.refresh(server_name)
 
 
 async def remove_server(server_name: str) -> None:
-    await conn.execute(
-        "DELETE FROM servers WHERE server_name = ?", (server_name,)
+    await registry.ensure_loaded()
+    await database.write(
+        "DELETE FROM servers WHERE server_name = ?", (server_name,),
+        durable=True
     )
-    await conn.commit()
+    await registry.refresh(server_name)
 
 
 async def toggle_server(server_name: str) -> Optional[str]:
-    cursor = await conn.execute(
-        "SELECT is_active FROM servers WHERE server_name = ?", (server_name,)
-    )
-    row = await cursor.fetchone()
-    await cursor.close()
+    server = await get_server(server_name)
 
-    if not row:
+    if not server:
         return None
 
-    new_status = 0 if row['is_active'] == 1 else 1
-    await conn.execute(
+    new_status = 0 if server['is_active'] == 1 else 1
+    await database.write(
         "UPDATE servers SET is_active = ? WHERE server_name = ?",
-        (new_status, server_name)
+        (new_status, server_name),
+        durable=True
     )
-    await conn.commit()
+    await registry.refresh(server_name)
 
     return "activated" if new_status else "deactivated"
 
 
 async def get_server(server_name: str) -> Optional[Dict]:
-    cursor = await conn.execute(
-        "SELECT * FROM servers WHERE server_name = ?", (server_name,)
-    )
-    row = await cursor.fetchone()
-    await cursor.close()
+    await registry.ensure_loaded()
+    server = registry.by_name.get(server_name)
+
+    return dict(server) if server else None
+
+
+async def get_server_by_topic(topic_id: Optional[int], active_only: bool = True) -> Optional[Dict]:
+    await registry.ensure_loaded()
+    server = registry.by_topic.get(topic_id)
 
-    return dict(row) if row else None
+    if not server or (active_only and not server["is_active"]):
+        return None
+    return dict(server)
+
+
+async def get_server_by_port(port: int, active_only: bool = True) -> Optional[Dict]:
+    await registry.ensure_loaded()
+    server = registry.by_port.get(port)
+
+    if not server or (active_only and not server["is_active"]):
+        return None
+    return dict(server)
 
 
-async def get_servers(active_only: bool = False) -> List[Dict]:
-    query = "SELECT * FROM servers"
-    params = ()
+def parse_tags(value: Optional[str]) -> List[str]:
+    """Parses the comma separated ``tags`` column of a server."""
+    if not value:
+        return []
+    return [tag for tag in (tag.strip().lower() for tag in value.split(",")) if tag]
 
-    if active_only:
-        query += " WHERE is_active = 1"
 
-    query += " ORDER BY server_name"
+async def get_servers(active_only: bool = False, tags: Optional[Iterable[str]] = None) -> List[Dict]:
+    """Returns the servers sorted by name, only those with one of ``tags`` if given."""
+    await registry.ensure_loaded()
+    servers = sorted(registry.by_name.values(), key=lambda server: server["server_name"])
 
-    cursor = await conn.execute(query, params)
-    rows = await cursor.fetchall()
-    await cursor.close()
+    if tags is not None:
+        tags = set(tags)
+        servers = [server for server in servers if tags.intersection(parse_tags(server["tags"]))]
 
-    return [dict(row) for row in rows]
+    return [dict(server) for server in servers if server["is_active"] or not active_only]
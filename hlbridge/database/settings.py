@@ -2,12 +2,14 @@
 # Copyright (c) 2025 Elinsrc
 
 from .core import database
+from .roles import roles
 
 conn = database.get_conn()
 
 
 async def set_settings(owner_id: int, chat_id: int, topic_id: int):
-    await conn.execute(
+    await roles.ensure_loaded()
+    await database.write(
         """
         INSERT INTO bot_settings (owner_id, chat_id, topic_id)
         VALUES (?, ?, ?)
@@ -16,8 +18,9 @@ async def set_settings(owner_id: int, chat_id: int, topic_id: int):
             topic_id = excluded.topic_id
         """,
         (owner_id, chat_id, topic_id),
+        durable=True
     )
-    await conn.commit()
+    roles.owner_id = owner_id
 
 
 async def get_settings():
@@ -30,7 +33,5 @@ async def get_settings():
 
 
 async def user_owner(user_id: int) -> bool:
-    cursor = await conn.execute("SELECT owner_id FROM bot_settings LIMIT 1")
-    row = await cursor.fetchone()
-    await cursor.close()
-    return row is not None and row[0] == user_id
+    await roles.ensure_loaded()
+    return roles.owner_id is not None and roles.owner_id == user_id
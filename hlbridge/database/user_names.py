@@ -1,13 +1,37 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Elinsrc
 
+from loguru import logger
+
+from .cache import LRUCache, NOT_CACHED
 from .core import database
 
 conn = database.get_conn()
 
+# Users whose custom name (or lack of one) is kept in memory
+CACHE_SIZE = 10000
+
+
+class UserNameCache(LRUCache):
+    """Custom names of recently seen users, written through by this module.
+
+    Users without a custom name are cached as None too, since most people
+    relaying messages never set one. Users evicted from the cache are read
+    from the table again on their next message.
+    """
+
+    async def warm(self):
+        rows = await get_all_user_names()
+        for user_id, _, custom_name in rows[-self.size:]:
+            self.put(user_id, custom_name)
+        logger.info(f"Loaded {len(self)} custom user names")
+
+
+name_cache = UserNameCache(CACHE_SIZE)
+
 
 async def set_user_name(user_id: int, default_name: str, custom_name: str):
-    await conn.execute(
+    await database.write(
         '''
         INSERT INTO user_names (user_id, default_name, custom_name)
         VALUES (?, ?, ?)
@@ -17,21 +41,28 @@ async def set_user_name(user_id: int, default_name: str, custom_name: str):
         ''',
         (user_id, default_name, custom_name)
     )
-    await conn.commit()
+    name_cache.put(user_id, custom_name)
 
 
 async def remove_user_name(user_id: int):
-    await conn.execute('DELETE FROM user_names WHERE user_id = ?', (user_id,))
-    await conn.commit()
+    await database.write('DELETE FROM user_names WHERE user_id = ?', (user_id,))
+    name_cache.put(user_id, None)
 
 
 async def get_user_name(user_id: int) -> str:
+    name = name_cache.get(user_id)
+    if name is not NOT_CACHED:
+        return name
+
     cursor = await conn.execute(
         'SELECT custom_name FROM user_names WHERE user_id = ?', (user_id,)
     )
     row = await cursor.fetchone()
     await cursor.close()
-    return row[0] if row else None
+
+    name = row[0] if row else None
+    name_cache.put(user_id, name)
+    return name
 
 
 async def get_all_user_names():
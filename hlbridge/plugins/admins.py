@@ -1,5 +1,9 @@
 import re
 import io
+import html
+import time
+import asyncio
+from datetime import datetime
 
 from hydrogram import Client, filters
 from hydrogram.types import Message
@@ -12,7 +16,9 @@ from hlbridge.database.settings import user_owner
 from hlbridge.utils import HLServer, remove_color_tags, commands
 from hlbridge.utils.decorators import admin_only
 from hlbridge.utils.localization import Strings, use_chat_lang
-from hlbridge.database.servers import get_servers
+from hlbridge.config import RCON_BROADCAST_LIMIT
+from hlbridge.database.servers import get_server_by_topic, get_servers, parse_tags
+from hlbridge.database.chat_history import search_chat_history
 
 
 async def protected_user(user_id: int) -> bool:
@@ -126,11 +132,7 @@ async def rcon_command(c: Client, m: Message, s: Strings):
 
     command_text = args[1].strip()
 
-    servers = await get_servers(active_only=True)
-    server = next(
-        (srv for srv in servers if srv["topic_id"] == m.message_thread_id),
-        None
-    )
+    server = await get_server_by_topic(m.message_thread_id)
 
     if not server:
         await m.reply(f"{s('rcon_not_allowed')}")
@@ -155,7 +157,147 @@ async def rcon_command(c: Client, m: Message, s: Strings):
     await m.reply_document(bio)
 
 
+async def run_rcon(server, command_text: str, limit: asyncio.Semaphore):
+    async with limit:
+        hlserver = HLServer(ip="127.0.0.1", port=server["port"], protocol=server["protocol"])
+        start = time.monotonic()
+        try:
+            result = await hlserver.rcon(server["rcon_password"], command_text)
+        except Exception as e:
+            result = f"Error: {e}"
+        return result, time.monotonic() - start
+
+
+@Client.on_message(filters.command("rcon_all"))
+@admin_only
+@use_chat_lang
+async def rcon_all_command(c: Client, m: Message, s: Strings):
+    args = m.text.split(maxsplit=1)
+    if len(args) < 2:
+        await m.reply(s("rcon_all_usage"))
+        return
+
+    command_text = args[1].strip()
+    tags = None
+    if command_text.startswith("["):
+        tags_arg, _, command_text = command_text[1:].partition("]")
+        tags = parse_tags(tags_arg)
+        command_text = command_text.strip()
+
+    if not command_text:
+        await m.reply(s("rcon_all_usage"))
+        return
+
+    servers = await get_servers(active_only=True, tags=tags)
+    if not servers:
+        await m.reply(s("rcon_all_no_servers"))
+        return
+
+    start = time.monotonic()
+    limit = asyncio.Semaphore(RCON_BROADCAST_LIMIT)
+    results = await asyncio.gather(*(run_rcon(server, command_text, limit) for server in servers))
+    elapsed = time.monotonic() - start
+
+    sections = []
+    answered = 0
+    for server, (result, latency) in zip(servers, results):
+        result = remove_color_tags(result).strip()
+        answered += bool(result)
+        sections.append(
+            f"=== {server['server_name']} ({server['port']}) - {latency * 1000:.0f} ms ===\n"
+            f"{result or s('rcon_no_response')}\n"
+        )
+
+    bio = io.BytesIO("\n".join(sections).encode('utf-8'))
+    bio.name = "rcon_all_result.txt"
+
+    await m.reply_document(
+        bio,
+        caption=s("rcon_all_done").format(
+            command=html.escape(command_text), answered=answered, servers=len(servers), time=f"{elapsed:.2f}"
+        )
+    )
+
+
+HISTORY_FILTERS = ("player", "server", "since", "until")
+TIME_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(value: str):
+    """Parses a time ago such as 30m, 12h or 7d, or a local date as YYYY-MM-DD [HH:MM]."""
+    value = value.strip()
+    if value[:-1].isdigit() and value[-1:] in TIME_UNITS:
+        return time.time() - int(value[:-1]) * TIME_UNITS[value[-1]]
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+@Client.on_message(filters.command("history"))
+@admin_only
+@use_chat_lang
+async def history_command(c: Client, m: Message, s: Strings):
+    args = m.text.split(maxsplit=1)
+    if len(args) < 2:
+        await m.reply(s("history_usage"))
+        return
+
+    search = {}
+    for arg in re.findall(r"\[([^\]]+)\]", args[1]):
+        key, sep, value = arg.partition("=")
+        key = key.strip()
+        if not sep or key not in HISTORY_FILTERS:
+            await m.reply(s("history_usage"))
+            return
+        search[key] = value.strip()
+
+    for key in ("since", "until"):
+        if key in search:
+            search[key] = parse_time(search[key])
+            if search[key] is None:
+                await m.reply(s("history_invalid_time"))
+                return
+
+    start = time.monotonic()
+    rows = await search_chat_history(
+        text=re.sub(r"\[[^\]]*\]", "", args[1]).strip(),
+        player=search.get("player"),
+        server_name=search.get("server"),
+        since=search.get("since"),
+        until=search.get("until"),
+    )
+    elapsed = time.monotonic() - start
+
+    if not rows:
+        await m.reply(s("history_no_results"))
+        return
+
+    lines = []
+    for row in reversed(rows):
+        team = "(team) " if row["team"] else ""
+        lines.append(
+            f"{datetime.fromtimestamp(row['time']):%Y-%m-%d %H:%M:%S} [{row['server_name']}] "
+            f"{team}{row['player']}: {row['message']}"
+        )
+    result = "\n".join(lines)
+    summary = s("history_found").format(lines=len(rows), time=f"{elapsed * 1000:.0f}")
+
+    if len(result) < 3500:
+        await m.reply(f"{summary}\n\n<code>{html.escape(result)}</code>")
+        return
+
+    bio = io.BytesIO(result.encode('utf-8'))
+    bio.name = "history.txt"
+
+    await m.reply_document(bio, caption=summary)
+
+
 commands.add_command("set_name", "admins")
 commands.add_command("remove_name", "admins")
 commands.add_command("custom_names", "general")
 commands.add_command("rcon", "admins")
+commands.add_command("rcon_all", "admins")
+commands.add_command("history", "admins")
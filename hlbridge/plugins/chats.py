@@ -2,12 +2,14 @@
 # Copyright (c) 2018-2024 Amano LLC
 
 from hydrogram import Client
-from hydrogram.types import Message
+from hydrogram.types import ChatMemberUpdated, Message
 
+from hlbridge.database.chat_members import member_cache
 from hlbridge.database.chats import add_chat, chat_exists
 
 # This is the first plugin run to guarantee
 # that the actual chat is initialized in the DB.
+# Known chats are kept in memory, so this is a set lookup for every update.
 
 @Client.on_message(group=-1)
 async def check_chat(c: Client, m: Message):
@@ -17,3 +19,11 @@ async def check_chat(c: Client, m: Message):
 
     if not chatexists:
         await add_chat(chat_id, chat_type)
+
+
+@Client.on_chat_member_updated(group=-1)
+async def forget_member(c: Client, u: ChatMemberUpdated):
+    # Admin rights changed: check_perms must ask Telegram again
+    member = u.new_chat_member or u.old_chat_member
+    if member and member.user:
+        await member_cache.invalidate(u.chat.id, member.user.id)
@@ -1,9 +1,13 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Elinsrc
 
+import asyncio
+import html
+
 from loguru import logger
 
 from hydrogram import Client, filters
+from hydrogram.errors import MessageNotModified
 from hydrogram.types import (
     CallbackQuery,
     InlineKeyboardButton,
@@ -11,12 +15,15 @@ from hydrogram.types import (
     Message,
 )
 
-from hlbridge.utils import HLServer, remove_color_tags, commands
+from hlbridge.config import STATUS_CACHE_TTL
+from hlbridge.utils import StatusCache, format_player, format_server_info, remove_color_tags, commands
 from hlbridge.utils.decorators import owner_only
 from hlbridge.utils.localization import Strings, use_chat_lang
 
 from hlbridge.database.servers import get_servers
 
+status_cache = StatusCache(STATUS_CACHE_TTL)
+
 
 @Client.on_message(filters.command("id"))
 @use_chat_lang
@@ -43,6 +50,10 @@ async def status(c: Client, m: Message, s: Strings):
         await m.reply_text(s("status_no_servers"))
         return
 
+    if len(m.command) > 1 and m.command[1].lower() == "all":
+        await m.reply_text(await build_status_table(servers, s))
+        return
+
     for server in servers:
         button = InlineKeyboardButton(
             text=server['server_name'],
@@ -54,21 +65,61 @@ async def status(c: Client, m: Message, s: Strings):
     await m.reply_text(s("status_select_server"), reply_markup=reply_markup)
 
 
+async def build_status_table(servers, s: Strings) -> str:
+    # Every server is queried at once, each bounded by its own timeout
+    statuses = await asyncio.gather(
+        *(status_cache.get("127.0.0.1", server["port"], server["protocol"]) for server in servers),
+        return_exceptions=True
+    )
+
+    rows = [(s("status_column_server"), s("status_column_map"), s("status_column_players"))]
+    online = total = 0
+    for server, status in zip(servers, statuses):
+        name = remove_color_tags(server["server_name"])
+        if isinstance(status, BaseException) or status.info is None:
+            rows.append((name, s("status_offline"), "-"))
+            continue
+
+        info = status.info
+        rows.append((name, remove_color_tags(info.map), f"{info.players}/{info.max_players}"))
+        online += 1
+        total += info.players
+
+    widths = [max(len(row[i]) for row in rows) for i in range(2)]
+    table = "\n".join(
+        f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]}" for row in rows
+    )
+
+    return (
+        f"<code>{html.escape(table)}</code>\n\n"
+        + s("status_all_total").format(players=total, online=online, servers=len(servers))
+    )
+
+
 @Client.on_callback_query(filters.regex("^server_info"))
 @use_chat_lang
 async def server_info(c: Client, m: CallbackQuery, s: Strings):
     _, port, protocol = m.data.split("|")
 
-    status = HLServer("127.0.0.1", int(port), int(protocol))
-    server_info = '\n'.join(await status.get_server_info())
-    player_list = '\n'.join(await status.get_players())
+    status = await status_cache.get("127.0.0.1", int(port), int(protocol))
+    if status.info is None:
+        await m.answer(s("status_server_offline"), show_alert=True)
+        return
+
+    server_info = format_server_info(status.info)
+    player_list = '\n'.join(format_player(player) for player in status.players)
 
     msg = f"<code>{server_info}"
     if player_list:
         msg += s("status_player_list_header").format(player_list=player_list)
     msg += "</code>"
+    msg += s("status_updated_ago").format(age=int(status.age))
 
-    await m.message.edit_text(remove_color_tags(msg))
+    try:
+        await m.message.edit_text(remove_color_tags(msg))
+    except MessageNotModified:
+        # Pressed again while the same status is still shown
+        pass
     await m.answer()
 
 
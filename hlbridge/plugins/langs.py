@@ -16,7 +16,7 @@ from hydrogram.types import (
 
 from hlbridge.database.localization import set_db_lang
 from hlbridge.utils.decorators import require_admin
-from hlbridge.utils.localization import Strings, langdict, use_chat_lang
+from hlbridge.utils.localization import Strings, forget_lang, langdict, use_chat_lang
 
 
 def gen_langs_kb():
@@ -66,6 +66,7 @@ async def chlang(c: Client, m: CallbackQuery | Message, s: Strings):
 async def set_chat_lang(c: Client, m: CallbackQuery):
     lang = m.data.split()[1]
     await set_db_lang(m.message.chat.id, m.message.chat.type, lang)
+    forget_lang(m)
 
     await set_chat_lang_edit(c, m)
 
@@ -32,10 +32,12 @@ from hlbridge.database.servers import (
     remove_server,
     toggle_server,
     get_server,
-    get_servers
+    get_server_by_topic,
+    get_servers,
+    parse_tags
 )
 
-from hlbridge.utils import commands
+from hlbridge.utils import EVENT_TYPES, commands, parse_events
 from hlbridge.utils.decorators import owner_only
 from hlbridge.utils.localization import Strings, use_chat_lang
 
@@ -78,7 +80,11 @@ async def add_admin(c: Client, m: Message, s: Strings):
         await m.reply(s("give_me_user_id"))
         return
 
-    user_id = m.command[1]
+    try:
+        user_id = int(m.command[1])
+    except ValueError:
+        await m.reply(s("invalid_user_id"))
+        return
 
     admin = await user_admin(user_id)
     if admin:
@@ -103,7 +109,11 @@ async def del_admin(c: Client, m: Message, s: Strings):
         await m.reply(s("give_me_user_id"))
         return
 
-    user_id = m.command[1]
+    try:
+        user_id = int(m.command[1])
+    except ValueError:
+        await m.reply(s("invalid_user_id"))
+        return
 
     try:
         admin = await user_admin(user_id)
@@ -183,14 +193,12 @@ async def add_server_command(c: Client, m: Message, s: Strings):
             return
 
         server_name = args[0].strip()
-        servers_list = await get_servers()
-        for srv in servers_list:
-            if srv["server_name"] == server_name:
-                await m.reply(s("server_name_already_used").format(name=server_name))
-                return
-            if srv["topic_id"] == topic_id:
-                await m.reply(s("topic_id_already_used").format(topic_id=topic_id))
-                return
+        if await get_server(server_name):
+            await m.reply(s("server_name_already_used").format(name=server_name))
+            return
+        if await get_server_by_topic(topic_id, active_only=False):
+            await m.reply(s("topic_id_already_used").format(topic_id=topic_id))
+            return
 
         server = {
             "server_name": server_name,
@@ -257,15 +265,22 @@ async def update_server_command(c: Client, m: Message, s: Strings):
                 updates[key] = value
 
         if "topic_id" in updates:
-            servers_list = await get_servers()
-            for srv in servers_list:
-                if srv["topic_id"] == updates["topic_id"] and srv["server_name"] != server_name:
-                    await m.reply(s("topic_id_already_used").format(topic_id=updates["topic_id"]))
-                    return
+            srv = await get_server_by_topic(updates["topic_id"], active_only=False)
+            if srv and srv["server_name"] != server_name:
+                await m.reply(s("topic_id_already_used").format(topic_id=updates["topic_id"]))
+                return
 
         if "port" in updates and not (1 <= updates["port"] <= 65535):
             await m.reply(s("invalid_port"))
             return
+        if "log_events" in updates:
+            events = parse_events(updates["log_events"])
+            if any(event not in EVENT_TYPES for event in events):
+                await m.reply(s("invalid_log_events").format(events=", ".join(EVENT_TYPES)))
+                return
+            updates["log_events"] = ",".join(events)
+        if "tags" in updates:
+            updates["tags"] = ",".join(parse_tags(updates["tags"])) or None
         if "log_port" in updates and not (1 <= updates["log_port"] <= 65535):
             await m.reply(s("invalid_log_port"))
             return
@@ -302,6 +317,8 @@ async def manage_server(c: Client, q: CallbackQuery, s: Strings):
         f"topic_id: {server['topic_id']}\n"
         f"connectionless_args: {server['connectionless_args']}\n"
         f"rcon_password: {server['rcon_password']}\n"
+        f"log_events: {','.join(parse_events(server['log_events']))}\n"
+        f"tags: {','.join(parse_tags(server['tags']))}\n"
     )
 
     keyboard = InlineKeyboardMarkup([
@@ -5,26 +5,33 @@ from loguru import logger
 from hydrogram import Client, filters
 from hydrogram.types import Message
 
-from hlbridge.utils import Socket
-from hlbridge.database.servers import get_servers
+from hlbridge.utils import udp_pool
+from hlbridge.database.servers import get_server_by_topic
 from hlbridge.database.user_names import get_user_name
 
 
 @Client.on_message(filters.text)
 async def send_to_hl(c: Client, m: Message):
-    servers = await get_servers(active_only=True)
+    server = await get_server_by_topic(m.message_thread_id)
+    if not server:
+        return
+
     user_name = await get_user_name(m.from_user.id) or m.from_user.username
 
-    for server in servers:
-        if m.message_thread_id != server.get("topic_id"):
-            continue
+    server_name = server["server_name"]
+    server_port = server["port"]
+    connectionless_args = server["connectionless_args"]
+
+    msg = f"(telegram) {user_name}: {m.text}"
+    query = b'\xff\xff\xff\xff%b%b\n' % (connectionless_args.encode(), msg.encode("utf8"))
 
-        server_name = server["server_name"]
-        server_port = server["port"]
-        connectionless_args = server["connectionless_args"]
+    # The endpoint stays connected and is reused for every message to this server
+    endpoint = await udp_pool.get("127.0.0.1", server_port)
+    endpoint.send(query)
 
-        msg = f"(telegram) {user_name}: {m.text}"
-        query = b'\xff\xff\xff\xff%b%b\n' % (connectionless_args.encode(), msg.encode("utf8"))
+    # Game lines relayed after this message must not be appended above it
+    pipeline = c.pipelines.get(server_name)
+    if pipeline:
+        pipeline.outbox.detach()
 
-        await Socket().send_msg("127.0.0.1", server_port, query)
-        logger.info(f"[{server_name}] Telegram: <<< {user_name}: {m.text} >>>")
+    logger.info(f"[{server_name}] Telegram: <<< {user_name}: {m.text} >>>")
@@ -1,26 +1,79 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Elinsrc
 
-from .hlserver import HLServer
-from .socket import Socket
+from .hlserver import HLServer, format_player, format_server_info
+from .listener import LogListener, LogPipeline
+from .logparser import (
+    EVENT_TYPES,
+    LogEvent,
+    LogParser,
+    format_event,
+    parse_events
+)
+from .netinfo import PlayerInfo, ServerInfo, parse_players, parse_server_info
+from .outbox import Outbox
+from .scheduler import (
+    PRIORITY_CHAT,
+    PRIORITY_EVENT,
+    PRIORITY_KILL,
+    PRIORITY_REPLY,
+    SendScheduler,
+    event_priority
+)
+from .socket import (
+    LogProtocol,
+    ServerEndpoint,
+    Socket,
+    SocketPool,
+    bind_datagram_endpoint,
+    udp_pool
+)
+from .status import ServerStatus, StatusCache
 from .utils import (
     check_perms,
     commands,
     remove_color_tags,
     format_time,
-    get_commit,
-    get_version_number,
     InterceptHandler
 )
+from .version import get_commit, get_version, get_version_number
 
 __all__: list[str] = [
     "HLServer",
+    "format_player",
+    "format_server_info",
+    "EVENT_TYPES",
+    "LogEvent",
+    "LogListener",
+    "LogParser",
+    "LogPipeline",
+    "LogProtocol",
+    "format_event",
+    "parse_events",
+    "PlayerInfo",
+    "ServerInfo",
+    "parse_players",
+    "parse_server_info",
+    "Outbox",
+    "PRIORITY_CHAT",
+    "PRIORITY_EVENT",
+    "PRIORITY_KILL",
+    "PRIORITY_REPLY",
+    "SendScheduler",
+    "event_priority",
+    "ServerEndpoint",
     "Socket",
+    "SocketPool",
+    "bind_datagram_endpoint",
+    "udp_pool",
+    "ServerStatus",
+    "StatusCache",
     "check_perms",
     "commands",
     "remove_color_tags",
     "format_time",
     "get_commit",
+    "get_version",
     "get_version_number",
     "InterceptHandler"
 ]
@@ -17,7 +17,8 @@ from hlbridge.utils.localization import (
 )
 from hlbridge.utils.utils import check_perms
 
-from hlbridge.database.settings import get_settings, user_owner
+from hlbridge.database.roles import roles
+from hlbridge.database.settings import user_owner
 from hlbridge.database.admins import user_admin
 
 if TYPE_CHECKING:
@@ -101,8 +102,8 @@ def owner_only(func):
             get_locale_string,
             lang,
         )
-        settings = await get_settings()
-        if not settings["owner_id"]:
+        await roles.ensure_loaded()
+        if not roles.owner_id:
             return
 
         is_owner = await user_owner(message.from_user.id)
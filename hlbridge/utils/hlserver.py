@@ -1,106 +1,158 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2025 Elinsrc
 
-import re
 import asyncio
-import asyncio_dgram
+import itertools
+from typing import Dict, List, Optional, Tuple
 
-from .socket import Socket
-from .utils import remove_color_tags, format_time
+from .logparser import COLOR_TAGS
+from .netinfo import PlayerInfo, ServerInfo, parse_players, parse_server_info
+from .socket import ServerEndpoint, Socket, udp_pool
+from .utils import format_time
 
+# netinfo request types
+NETINFO_PLAYERS = 3
+NETINFO_SERVER = 4
 
-class HLServer:
-    def __init__(self, ip, port, protocol, timeout = 0.5):
-        self.ip = ip
-        self.port = port
-        self.protocol = protocol
-        self.timeout = timeout
-        self.socket = Socket()
-
-    async def get_players(self):
-        message = b'\xff\xff\xff\xff' + b'netinfo %b 0 3' % str(self.protocol).encode()
-
-        data = await self.socket.send_packet(self.ip, self.port, message, self.timeout)
-
-        if not data:
-            return {}
-
-        data = data[16:]
-        data = data.decode(errors='replace')
-        data = "\\" + data.replace("'", ' ').replace('\n', '')
-        data = data.split("\\")[1:]
-
-        if data[-1] == '':
-            data = data[:-1]
-
-        players_list = {}
+# rcon output is complete once nothing arrived for this long, and never
+# collected for longer than RCON_MAX_TIME
+RCON_QUIET_GAP = 0.15
+RCON_MAX_TIME = 5.0
 
-        # Check protocol version
-        if self.protocol == 49:
-            if 'players' in data:
-                num_players = int(data[data.index('players') + 1])
+rcon_tokens = itertools.count()
 
-                for i in range(num_players):
-                    name = data[data.index(f"p{i}name") + 1]
-                    frags = data[data.index(f"p{i}frags") + 1]
-                    time = data[data.index(f"p{i}time") + 1]
 
-                    players_list[i] = [
-                        name,
-                        frags,
-                        time
-                        ]
-        else:
-            for i in range(0, len(data), 4):
-                if i + 3 < len(data):
-                    index = data[i]
-                    name = data[i + 1]
-                    frags = data[i + 2]
-                    time = data[i + 3]
+def clean(text: str) -> str:
+    if "^" in text:
+        text = COLOR_TAGS.sub("", text)
+    return text.replace("'", " ").replace('"', " ")
 
-                    players_list[index] = [
-                        name,
-                        frags,
-                        time
-                        ]
 
-        players = []
+def format_server_info(info: ServerInfo) -> str:
+    return f"Server: {clean(info.hostname)}\nMap: {clean(info.map)}({info.players}/{info.max_players})"
 
-        for index, player_info in players_list.items():
-            players.append(f"{index} {remove_color_tags(player_info[0])} [{player_info[1]}] ({format_time(player_info[2])})")
 
-        return players
+def format_player(player: PlayerInfo) -> str:
+    return f"{player.index} {clean(player.name)} [{player.frags}] ({format_time(player.time)})"
 
-    async def get_server_info(self):
-        message = b'\xff\xff\xff\xff' + b'netinfo %b 0 4' % str(self.protocol).encode()
 
-        data = await self.socket.send_packet(self.ip, self.port, message, self.timeout)
-        data = data.decode(errors='replace')
-        data = "\\" + data.replace("'", ' ').replace('"', ' ').replace("'", ' ').replace('\n', '')
-        data = data.split("\\")[2:]
-
-        server_info = []
-        server_info.append(f"Server: {data[1]}\nMap: {data[9]}({data[5]}/{data[7]})")
-
-        return server_info
+class HLServer:
+    def __init__(self, ip, port, protocol, timeout = 0.5):
+        self.ip = ip
+        self.port = port
+        self.protocol = protocol
+        self.timeout = timeout
+        self.socket = Socket()
 
+    def netinfo(self, kind: int) -> bytes:
+        return b'\xff\xff\xff\xff' + b'netinfo %b 0 %d' % (str(self.protocol).encode(), kind)
+
+    async def query_status(self) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """Sends both netinfo queries at once and waits one timeout for the replies.
+
+        Returns the server info and the player list replies, None for a reply
+        that did not arrive. Replies are told apart by the type they echo.
+        """
+        endpoint = await udp_pool.get(self.ip, self.port)
+        replies: Dict[bytes, bytes] = {}
+
+        async with endpoint.lock:
+            endpoint.drain()
+            endpoint.send(self.netinfo(NETINFO_SERVER))
+            endpoint.send(self.netinfo(NETINFO_PLAYERS))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout
+            while len(replies) < 2 and loop.time() < deadline:
+                data = await endpoint.recv(deadline - loop.time())
+                if data is None:
+                    break
+                fields = data[4:].split(b' ', 3)
+                if fields[0] == b'netinfo' and len(fields) > 2:
+                    replies[fields[2]] = data
+
+        return replies.get(b'%d' % NETINFO_SERVER), replies.get(b'%d' % NETINFO_PLAYERS)
+
+    async def get_status(self) -> Tuple[Optional[ServerInfo], List[PlayerInfo]]:
+        """Returns the server info and the player list, None for the info if offline."""
+        info, players = await self.query_status()
+        return (
+            parse_server_info(info) if info else None,
+            parse_players(players, self.protocol) if players else [],
+        )
+
+    async def get_players(self) -> List[PlayerInfo]:
+        data = await self.socket.send_packet(self.ip, self.port, self.netinfo(NETINFO_PLAYERS), self.timeout)
+        return parse_players(data, self.protocol) if data else []
+
+    async def get_server_info(self) -> Optional[ServerInfo]:
+        data = await self.socket.send_packet(self.ip, self.port, self.netinfo(NETINFO_SERVER), self.timeout)
+        return parse_server_info(data) if data else None
+
+    async def get_challenge(self, endpoint: ServerEndpoint) -> Optional[bytes]:
+        """Requests the rcon challenge GoldSrc servers expect, None if the server has none."""
+        endpoint.send(b"\xFF\xFF\xFF\xFFchallenge rcon\n")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while loop.time() < deadline:
+            data = await endpoint.recv(deadline - loop.time())
+            if data is None:
+                break
+            if data.startswith(b"\xFF\xFF\xFF\xFFchallenge rcon "):
+                return data[19:].strip()
+        return None
 
     async def rcon(self, password: str, command: str) -> str:
-        message = b"\xFF\xFF\xFF\xFFrcon %b %b\x00" % (password.encode(), command.encode())
-
-        stream = await asyncio_dgram.connect((self.ip, self.port))
-        await stream.send(message)
+        """Runs an rcon command and returns its output as soon as it is complete.
+
+        The command is followed by a second rcon packet echoing a unique token.
+        The server runs both in order, so the output is complete once the token
+        comes back. If it never does (a wrong password or a server without
+        echo) the reply ends after RCON_QUIET_GAP seconds without new packets.
+        Protocol 48 servers are asked for a GoldSrc rcon challenge once; those
+        that answer get it in front of every command.
+        """
+        endpoint = await udp_pool.get(self.ip, self.port)
+        token = f"hlbridge-{next(rcon_tokens)}"
 
         responses = []
-        while True:
-            try:
-                data, _ = await asyncio.wait_for(stream.recv(), timeout=self.timeout)
-                if data.startswith(b"\xFF\xFF\xFF\xFF"):
-                    responses.append(data[4:].decode("utf-8", errors="ignore"))
-            except asyncio.TimeoutError:
-                break
-
-        stream.close()
+        async with endpoint.lock:
+            endpoint.drain()
+
+            if self.protocol == 48 and endpoint.challenge is None:
+                endpoint.challenge = await self.get_challenge(endpoint) or b""
+
+            if endpoint.challenge:
+                prefix = b'rcon %b "%b"' % (endpoint.challenge, password.encode())
+            else:
+                prefix = b"rcon %b" % password.encode()
+            endpoint.send(b"\xFF\xFF\xFF\xFF%b %b\x00" % (prefix, command.encode()))
+            endpoint.send(b"\xFF\xFF\xFF\xFF%b echo %b\x00" % (prefix, token.encode()))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + RCON_MAX_TIME
+            wait = self.timeout  # For the first packet, then the quiet gap
+            while loop.time() < deadline:
+                data = await endpoint.recv(min(wait, deadline - loop.time()))
+                if data is None:
+                    break
+                if not data.startswith(b"\xFF\xFF\xFF\xFF"):
+                    continue
+
+                text = data[4:].decode("utf-8", errors="ignore")
+                if text.startswith("l") and endpoint.challenge:
+                    text = text[1:]  # GoldSrc print packets start with 'l'
+                if token in text:
+                    responses.append(text[:text.find(token)])
+                    break
+                responses.append(text)
+                if "Bad rcon_password" in text:
+                    break  # The echo is refused the same way
+                if "Bad challenge" in text:
+                    endpoint.challenge = None  # The server restarted, ask again next time
+                    break
+                wait = RCON_QUIET_GAP
 
         result = "".join(responses)
         cleaned = "\n".join(line for line in result.splitlines() if line.strip() != "print")
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from loguru import logger
+
+from .logparser import CHAT_EVENTS, LogParser, format_event
+from .outbox import Outbox
+from .scheduler import event_priority
+from .socket import bind_datagram_endpoint
+
+
+class LogPipeline:
+    """Parses the log datagrams of one server and hands the lines to its outbox.
+
+    Only the ``events`` of the server are relayed. With a ``history`` every
+    chat line is also parsed and handed to it to be archived, whether the
+    server relays chat or not.
+    """
+
+    def __init__(self, server_name: str, protocol: int, events: Iterable[str], outbox: Outbox, history=None):
+        self.server_name = server_name
+        self.outbox = outbox
+        self.history = history
+        self.configure(protocol, events)
+
+    def configure(self, protocol: int, events: Iterable[str]):
+        self.events = frozenset(events)
+        parsed = self.events | CHAT_EVENTS if self.history is not None else self.events
+        self.parser = LogParser(protocol, parsed)
+
+    def feed(self, data: bytes, addr: Optional[Tuple[str, int]] = None):
+        event = self.parser.parse_datagram(data)
+        if event is None:
+            return
+
+        if self.history is not None and event.type in CHAT_EVENTS:
+            self.history.add(self.server_name, event)
+
+        if event.type not in self.events:
+            return
+
+        text = format_event(event)
+        if text:  # Only send message if formatting function returned a valid text
+            self.outbox.submit(text, event_priority(event.type))
+            logger.info(f"[{self.server_name}] <<< {text} >>>")
+
+
+class LogListener:
+    """A single UDP socket receiving the logs of every server.
+
+    Game servers send their logs from their game port, so datagrams are
+    routed to a pipeline by source address and port. A server whose address
+    is not an exact match is looked up by port alone, which covers servers
+    bound to another local interface.
+    """
+
+    def __init__(self, ip: str, port: int):
+        self.ip = ip
+        self.port = port
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+        self.routes: Dict[Tuple[str, int], LogPipeline] = {}
+        self.ports: Dict[int, LogPipeline] = {}
+        self.unknown: Set[Tuple[str, int]] = set()
+
+    async def start(self):
+        self.transport = await bind_datagram_endpoint(self.ip, self.port, self.route)
+
+    def add_route(self, ip: str, port: int, pipeline: LogPipeline):
+        self.routes[(ip, port)] = pipeline
+        self.ports[port] = pipeline
+        self.unknown.discard((ip, port))
+
+    def remove_route(self, ip: str, port: int):
+        pipeline = self.routes.pop((ip, port), None)
+        if pipeline is not None and self.ports.get(port) is pipeline:
+            del self.ports[port]
+
+    def route(self, data: bytes, addr: Tuple[str, int]):
+        pipeline = self.routes.get(addr) or self.ports.get(addr[1])
+        if pipeline is not None:
+            pipeline.feed(data, addr)
+        elif addr not in self.unknown:
+            self.unknown.add(addr)
+            logger.warning(f"Ignoring logs from unknown server {addr[0]}:{addr[1]}")
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+            logger.info("Socket closed!")
@@ -6,10 +6,15 @@ from __future__ import annotations
 
 import yaml
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from functools import partial
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from hydrogram.enums import ChatType
 from hydrogram.types import CallbackQuery, InlineQuery, Message, ChatMemberUpdated
 
@@ -25,35 +30,54 @@ enabled_locales: list[str] = [
 default_language: str = "en-GB"
 
 
-def cache_locales(locales: list[str]) -> dict[str, dict[str, str]]:
-    # init ldict with empty dict
-    locales_dict = {}
+class Locales(Mapping):
+    """The strings of every enabled locale, each file parsed the first time it is used."""
+
+    def __init__(self, locales: list[str]):
+        self.files: dict[str, Path] = {}
+        self.loaded: dict[str, dict[str, str]] = {}
+
+        for locale in locales:
+            file = Path("locales", f"{locale}.yml")
+
+            if not file.exists():
+                logging.warning(
+                    "Unable to find locale %s. This locale will fallback to %s",
+                    locale,
+                    default_language,
+                )
+                continue
+
+            self.files[locale] = file
+
+    def __getitem__(self, locale: str) -> dict[str, str]:
+        locale_keys = self.loaded.get(locale)
+        if locale_keys is None:
+            if locale not in self.files:
+                raise KeyError(locale)
 
-    for locale in locales:
-        file = Path("locales", f"{locale}.yml")
+            with self.files[locale].open("r", encoding="utf8") as file:
+                locale_keys = yaml.load(file, Loader=SafeLoader)
 
-        if not file.exists():
-            logging.warning(
-                "Unable to find locale %s. This locale will fallback to %s",
-                locale,
-                default_language,
-            )
-            continue
+            if "_meta_language_name" not in locale_keys or "_meta_language_flag" not in locale_keys:
+                logging.warning(
+                    "Locale has required keys _meta_language_name or _meta_language_flag missing. This locale will not be loaded."
+                )
+                del self.files[locale]
+                raise KeyError(locale)
 
-        locale_keys = yaml.safe_load(file.open("r", encoding="utf8"))
+            self.loaded[locale] = locale_keys
 
-        if "_meta_language_name" not in locale_keys or "_meta_language_flag" not in locale_keys:
-            logging.warning(
-                "Locale has required keys _meta_language_name or _meta_language_flag missing. This locale will not be loaded."
-            )
-            continue
+        return locale_keys
 
-        locales_dict[locale] = locale_keys
+    def __iter__(self):
+        return iter(list(self.files))
 
-    return locales_dict
+    def __len__(self) -> int:
+        return len(self.files)
 
 
-langdict = cache_locales(enabled_locales)
+langdict = Locales(enabled_locales)
 
 
 def get_locale_string(
@@ -80,7 +104,22 @@ async def get_lang(message: CallbackQuery | Message | InlineQuery, client = None
         chat_type = chat.type
         lang = await get_db_lang(chat_id, chat_type)
         return lang if lang in enabled_locales else default_language
-    elif isinstance(message, CallbackQuery):
+
+    # Decorators stacked on one handler all ask for the language of the same update
+    lang = getattr(message, "_lang", None)
+    if lang is None:
+        lang = await resolve_lang(message)
+        message._lang = lang
+    return lang
+
+
+def forget_lang(message: CallbackQuery | Message | InlineQuery):
+    """Drops the language remembered on an update after the chat language changed."""
+    message._lang = None
+
+
+async def resolve_lang(message: CallbackQuery | Message | InlineQuery) -> str:
+    if isinstance(message, CallbackQuery):
         chat = message.message.chat if message.message else message.from_user
         chat_type = message.message.chat.type if message.message else ChatType.PRIVATE
     elif isinstance(message, Message):
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import re
+from typing import Iterable, Optional, Tuple
+
+# The log header has a fixed width: "MM/DD/YYYY - HH:MM:SS: "
+TIMESTAMP = re.compile(r'\d\d/\d\d/\d\d\d\d - \d\d:\d\d:\d\d: ')
+TIMESTAMP_LEN = 23
+
+COLOR_TAGS = re.compile(r'\^\d')
+
+EVENT_TYPES: Tuple[str, ...] = (
+    "say",
+    "say_team",
+    "kill",
+    "suicide",
+    "connect",
+    "join",
+    "disconnect",
+    "kick",
+    "name",
+    "team",
+    "map",
+)
+
+DEFAULT_EVENTS: Tuple[str, ...] = ("say", "map")
+
+CHAT_EVENTS = frozenset(("say", "say_team"))
+
+# Action that follows a '"Name<uid><steamid><team>" ' block. Actions whose
+# keyword ends with a quote carry a quoted argument.
+PLAYER_ACTIONS: Tuple[Tuple[str, str], ...] = (
+    ('say "', "say"),
+    ('killed "', "kill"),
+    ('say_team "', "say_team"),
+    ('committed suicide with "', "suicide"),
+    ('entered the game', "join"),
+    ('disconnected', "disconnect"),
+    ('connected, address "', "connect"),
+    ('changed name to "', "name"),
+    ('joined team "', "team"),
+)
+
+
+class Player:
+    __slots__ = ("name", "uid", "steam_id", "team")
+
+    def __init__(self, name: str, uid: str, steam_id: str, team: str):
+        self.name = name
+        self.uid = uid
+        self.steam_id = steam_id
+        self.team = team
+
+    def __repr__(self):
+        return f"Player({self.name!r}, {self.uid!r}, {self.steam_id!r}, {self.team!r})"
+
+
+class LogEvent:
+    """A single parsed log line.
+
+    ``text`` holds the quoted argument of the event: the chat message, the
+    map name, the new name, the joined team, the address or the kick reason.
+    """
+
+    __slots__ = ("type", "player", "target", "weapon", "text")
+
+    def __init__(
+        self,
+        type: str,
+        player: Optional[Player] = None,
+        target: Optional[Player] = None,
+        weapon: Optional[str] = None,
+        text: Optional[str] = None,
+    ):
+        self.type = type
+        self.player = player
+        self.target = target
+        self.weapon = weapon
+        self.text = text
+
+    def __repr__(self):
+        return (
+            f"LogEvent({self.type!r}, player={self.player!r}, target={self.target!r}, "
+            f"weapon={self.weapon!r}, text={self.text!r})"
+        )
+
+
+def read_player(body: str, start: int = 0) -> Tuple[Optional[Player], int]:
+    """Reads a '"Name<uid><steamid><team>"' block starting at ``start``.
+
+    Returns the player and the index right after the closing quote. Names
+    may contain '<' and '>' so the block is split from the right.
+    """
+    if not body.startswith('"', start):
+        return None, -1
+
+    end = body.find('>"', start + 1)
+    if end == -1:
+        return None, -1
+
+    fields = body[start + 1:end].rsplit('<', 3)
+    if len(fields) != 4:
+        return None, -1
+
+    name, uid, steam_id, team = fields
+    return Player(name, uid[:-1], steam_id[:-1], team), end + 2
+
+
+def quoted(body: str, start: int) -> str:
+    """Returns the argument opened at ``start`` up to its last closing quote."""
+    end = body.rfind('"', start)
+    return body[start:end] if end != -1 else body[start:]
+
+
+def format_event(event: LogEvent) -> Optional[str]:
+    kind = event.type
+    if kind == "say":
+        return f'{event.player.name}: {event.text}'
+    if kind == "say_team":
+        return f'({event.player.team}) {event.player.name}: {event.text}'
+    if kind == "map":
+        return f'Started map "{event.text}"'
+    if kind == "kill":
+        return f'"{event.player.name}" killed "{event.target.name}" with "{event.weapon}"'
+    if kind == "suicide":
+        return f'"{event.player.name}" committed suicide with "{event.weapon}"'
+    if kind == "connect":
+        return f'Player "{event.player.name}" connected'
+    if kind == "join":
+        return f'Player "{event.player.name}" has joined the game'
+    if kind == "disconnect":
+        return f'Player "{event.player.name}" has left the game'
+    if kind == "kick":
+        return f'Player "{event.player.name}" was kicked with message: "{event.text}"'
+    if kind == "name":
+        return f'Player "{event.player.name}" changed name to: "{event.text}"'
+    if kind == "team":
+        return f'Player "{event.player.name}" joined team "{event.text}"'
+    return None
+
+
+def parse_events(value: Optional[str]) -> Tuple[str, ...]:
+    """Parses the comma separated ``log_events`` column of a server."""
+    if value is None:
+        return DEFAULT_EVENTS
+    return tuple(e for e in (e.strip() for e in value.split(",")) if e)
+
+
+class LogParser:
+    """Turns raw log datagrams of one server into typed events.
+
+    A line is tokenized in a single left to right pass: the fixed-width
+    header is skipped, the player block is split on its brackets and the
+    action is identified by its leading keyword. Event types the server
+    has not enabled are dropped before any field is extracted.
+    """
+
+    def __init__(self, protocol: int, events: Iterable[str] = DEFAULT_EVENTS):
+        self.prefix = "log " if protocol == 49 else "log L "
+        self.offset = len(self.prefix) + TIMESTAMP_LEN
+        self.events = frozenset(events)
+        self.player_actions = tuple(
+            (keyword, kind) for keyword, kind in PLAYER_ACTIONS if kind in self.events
+        )
+
+    def parse_datagram(self, data: bytes) -> Optional[LogEvent]:
+        # Skip the \xff\xff\xff\xff header without copying the payload
+        line = str(memoryview(data)[4:], 'utf-8', 'replace').replace('\n', '')
+        return self.parse(COLOR_TAGS.sub('', line))
+
+    def parse(self, line: str) -> Optional[LogEvent]:
+        if not line.startswith(self.prefix) or not TIMESTAMP.match(line, len(self.prefix)):
+            return None
+
+        body = line[self.offset:]
+        if body.startswith('"'):
+            return self.parse_player_event(body) if self.player_actions else None
+        if body.startswith('Started map "'):
+            if "map" not in self.events:
+                return None
+            return LogEvent("map", text=body[13:body.find('"', 13)])
+        if body.startswith('Kick: "'):
+            return self.parse_kick(body) if "kick" in self.events else None
+
+        return None
+
+    def parse_player_event(self, body: str) -> Optional[LogEvent]:
+        pos = body.find('>" ', 1) + 3
+        if pos == 2:
+            return None
+
+        for keyword, kind in self.player_actions:
+            if not body.startswith(keyword, pos):
+                continue
+
+            player, _ = read_player(body)
+            if player is None:
+                return None
+            # "say" is a prefix of "say_team": the keyword includes the quote so they never overlap
+            pos += len(keyword)
+
+            if kind == "kill":
+                target, pos = read_player(body, pos - 1)
+                if target is None or not body.startswith(' with "', pos):
+                    return None
+                return LogEvent(kind, player, target=target, weapon=quoted(body, pos + 7))
+            if kind == "suicide":
+                return LogEvent(kind, player, weapon=body[pos:body.find('"', pos)])
+            if kind == "connect":
+                return LogEvent(kind, player, text=body[pos:body.find('"', pos)])
+            if kind in ("join", "disconnect"):
+                return LogEvent(kind, player)
+            return LogEvent(kind, player, text=quoted(body, pos))
+
+        return None
+
+    def parse_kick(self, body: str) -> Optional[LogEvent]:
+        player, pos = read_player(body, 6)
+        if player is None:
+            return None
+
+        reason = body.find('(message "', pos)
+        text = quoted(body[:-1] if body.endswith(')') else body, reason + 10) if reason != -1 else ""
+        return LogEvent("kick", player, text=text)
@@ -0,0 +1,101 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from typing import Dict, List, Optional
+
+
+class PlayerInfo:
+    __slots__ = ("index", "name", "frags", "time")
+
+    def __init__(self, index: str, name: str, frags: int, time: float):
+        self.index = index
+        self.name = name
+        self.frags = frags
+        self.time = time
+
+    def __repr__(self):
+        return f"PlayerInfo({self.index!r}, {self.name!r}, {self.frags!r}, {self.time!r})"
+
+
+class ServerInfo:
+    __slots__ = ("hostname", "map", "players", "max_players")
+
+    def __init__(self, hostname: str, map: str, players: int, max_players: int):
+        self.hostname = hostname
+        self.map = map
+        self.players = players
+        self.max_players = max_players
+
+    def __repr__(self):
+        return f"ServerInfo({self.hostname!r}, {self.map!r}, {self.players!r}, {self.max_players!r})"
+
+
+def to_int(value: Optional[str]) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def to_float(value: Optional[str]) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def reply_items(data: bytes) -> List[str]:
+    """Splits the body of a 'netinfo <context> <type> ' reply on its backslashes."""
+    parts = data[4:].split(b' ', 3)
+    if len(parts) < 4 or parts[0] != b'netinfo':
+        return []
+
+    items = parts[3].decode(errors='replace').replace('\n', '').split('\\')
+    if items and items[0] == '':
+        del items[0]
+    if items and items[-1] == '':
+        del items[-1]
+    return items
+
+
+def reply_fields(data: bytes) -> Dict[str, str]:
+    """Reads a '\\key\\value\\key\\value' reply into a dict in one pass."""
+    items = iter(reply_items(data))
+    return dict(zip(items, items))
+
+
+def parse_server_info(data: bytes) -> Optional[ServerInfo]:
+    fields = reply_fields(data)
+    if "hostname" not in fields:
+        return None
+
+    return ServerInfo(
+        fields["hostname"],
+        fields.get("map", ""),
+        to_int(fields.get("current")),
+        to_int(fields.get("max")),
+    )
+
+
+def parse_players(data: bytes, protocol: int) -> List[PlayerInfo]:
+    if protocol == 49:
+        # \players\N\p0name\...\p0frags\...\p0time\...
+        fields = reply_fields(data)
+        players = []
+        for i in range(to_int(fields.get("players"))):
+            name = fields.get(f"p{i}name")
+            if name is None:
+                break
+            players.append(PlayerInfo(
+                str(i), name, to_int(fields.get(f"p{i}frags")), to_float(fields.get(f"p{i}time"))
+            ))
+        return players
+
+    # index\name\frags\time for every player
+    items = reply_items(data)
+    indexes, names, frags, times = items[0::4], items[1::4], items[2::4], items[3::4]
+    try:
+        return list(map(PlayerInfo, indexes, names, map(int, frags), map(float, times)))
+    except ValueError:
+        # A malformed number should not hide the rest of the list
+        return list(map(PlayerInfo, indexes, names, map(to_int, frags), map(to_float, times)))
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+import html
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+from hydrogram.errors import BadRequest
+
+from .scheduler import PRIORITY_EVENT
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "summarize")
+
+
+def truncate_html(text: str, limit: int) -> str:
+    """Cuts escaped text to ``limit`` characters without splitting an entity."""
+    if len(text) <= limit:
+        return text
+    text = text[:limit]
+    amp = text.rfind("&", -5)
+    return text[:amp] if amp != -1 and ";" not in text[amp:] else text
+
+
+class Outbox:
+    """Delivers the lines relayed to one topic, decoupled from log receiving.
+
+    ``submit`` never waits: lines go into a bounded queue and a separate
+    delivery task sends them, so a FloodWait sleep in the client does not
+    stop the server's log socket from being read. When the queue is full the
+    ``overflow`` policy decides what is lost:
+
+    * ``drop_oldest`` discards the oldest queued line,
+    * ``drop_newest`` discards the incoming line,
+    * ``summarize`` discards the incoming line and reports how many were
+      skipped in the next message.
+
+    The delivery task merges the lines arriving within ``window`` seconds,
+    or up to ``max_chars``, into a single message. With ``edit`` enabled the
+    lines are appended to the previous message while it still has room. A
+    message is sent with the most urgent priority of the lines it carries.
+    """
+
+    def __init__(
+        self,
+        client,
+        chat_id: int,
+        topic_id: int,
+        window: float = 1.0,
+        max_chars: int = 4096,
+        edit: bool = False,
+        queue_size: int = 1000,
+        overflow: str = "drop_oldest",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'.")
+
+        self.client = client
+        self.chat_id = chat_id
+        self.topic_id = topic_id
+        self.window = window
+        self.max_chars = max_chars
+        self.edit = edit
+        self.overflow = overflow
+
+        self.queue: asyncio.Queue[Tuple[str, int]] = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        # Lines taken from the queue that are not delivered yet
+        self.pending: List[Tuple[str, int]] = []
+
+        self.delivered = 0
+        self.dropped = 0
+        self.reported = 0
+        self.skipped = 0
+
+        self.last_message_id: Optional[int] = None
+        self.last_text = ""
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def submit(self, text: str, priority: int = PRIORITY_EVENT):
+        # Messages are sent as HTML: a "<" of one player and a ">" of another
+        # would otherwise swallow every line between them.
+        text = truncate_html(html.escape(text, quote=False), self.max_chars)
+
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            if self.overflow == "summarize":
+                self.skipped += 1
+                return
+            self.queue.get_nowait()
+
+        self.queue.put_nowait((text, priority))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            if not self.pending:
+                self.pending.append(await self.queue.get())
+
+            size = sum(len(text) + 1 for text, _ in self.pending) - 1
+            deadline = loop.time() + self.window
+
+            # A window of 0 sends every line alone
+            while self.window > 0 and size <= self.max_chars:
+                try:
+                    if self.queue.empty():
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+
+                self.pending.append(item)
+                size += len(item[0]) + 1
+
+            # The lines stay pending until delivered, so close() can still send
+            # them if it cancels this task in the middle of a send.
+            # Leave room for the note on skipped lines
+            limit = self.max_chars - (len(self.skipped_note()) + 1 if self.skipped else 0)
+            count, size = 0, -1
+            for text, _ in self.pending:
+                if count and (self.window <= 0 or size + len(text) + 1 > limit):
+                    break
+                size += len(text) + 1
+                count += 1
+
+            batch = self.pending[:count]
+            await self.deliver([text for text, _ in batch], min(priority for _, priority in batch))
+            del self.pending[:count]
+
+    def skipped_note(self) -> str:
+        return f"[{self.skipped} lines skipped]"
+
+    async def deliver(self, lines: List[str], priority: int):
+        count = len(lines)
+        text = "\n".join(lines)
+        skipped = self.skipped
+        if skipped:
+            note = self.skipped_note()
+            # A single line may fill the message, the note then waits for the next one
+            if len(text) + len(note) + 1 <= self.max_chars:
+                text = f"{text}\n{note}"
+            else:
+                skipped = 0
+
+        try:
+            await self.send(text, priority)
+            self.delivered += count
+            # Lines skipped during the send are reported next time
+            self.skipped -= skipped
+        except Exception as e:
+            logger.error(f"Failed to deliver {count} lines to topic {self.topic_id}: {e}")
+
+        if self.dropped > self.reported:
+            logger.warning(
+                f"Topic {self.topic_id}: {self.dropped - self.reported} lines dropped "
+                f"({self.overflow}, {self.dropped} total, {self.queue.qsize()} queued)"
+            )
+            self.reported = self.dropped
+
+    async def send(self, text: str, priority: int = PRIORITY_EVENT):
+        if self.edit and self.last_message_id and len(self.last_text) + len(text) + 1 <= self.max_chars:
+            new_text = f"{self.last_text}\n{text}"
+            try:
+                await self.client.edit_message_text(
+                    chat_id=self.chat_id,
+                    message_id=self.last_message_id,
+                    text=new_text,
+                    disable_web_page_preview=True,
+                    priority=priority
+                )
+            except BadRequest as e:
+                # E.g. the message was deleted: never try to edit it again
+                logger.warning(f"Topic {self.topic_id}: cannot edit message {self.last_message_id}: {e}")
+                self.detach()
+            else:
+                self.last_text = new_text
+                return
+
+        message = await self.client.send_message(
+            chat_id=self.chat_id,
+            text=text,
+            message_thread_id=self.topic_id,
+            disable_web_page_preview=True,
+            disable_notification=True,
+            priority=priority
+        )
+        self.last_message_id = message.id
+        self.last_text = text
+
+    def detach(self):
+        """Starts a new message on the next delivery instead of editing the last one."""
+        self.last_message_id = None
+        self.last_text = ""
+
+    async def close(self, timeout: float = 5):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+        lines = [text for text, _ in self.pending]
+        self.pending = []
+        while not self.queue.empty():
+            lines.append(self.queue.get_nowait()[0])
+
+        if lines:
+            # Send what is left in one go, but never hold up a restart for long
+            text = "\n".join(lines)
+            if len(text) > self.max_chars:
+                # Keep the newest lines, starting at a line boundary
+                tail = text[-self.max_chars:]
+                text = tail.partition("\n")[2] or tail
+            try:
+                await asyncio.wait_for(self.send(text), timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Topic {self.topic_id}: {len(lines)} queued lines lost on close: {e}")
@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+# Lower values are sent first
+PRIORITY_REPLY = 0  # Answers to commands and button presses
+PRIORITY_CHAT = 1  # Player chat
+PRIORITY_EVENT = 2  # Map changes, joins, kicks...
+PRIORITY_KILL = 3  # Kill feed
+
+PRIORITY_NAMES = {
+    PRIORITY_REPLY: "replies",
+    PRIORITY_CHAT: "chat",
+    PRIORITY_EVENT: "events",
+    PRIORITY_KILL: "kill feed",
+}
+
+EVENT_PRIORITIES = {
+    "say": PRIORITY_CHAT,
+    "say_team": PRIORITY_CHAT,
+    "kill": PRIORITY_KILL,
+    "suicide": PRIORITY_KILL,
+}
+
+# Private chats tolerate about one message per second
+PRIVATE_RATE = 1.0
+PRIVATE_BURST = 5
+
+
+def event_priority(kind: str) -> int:
+    return EVENT_PRIORITIES.get(kind, PRIORITY_EVENT)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class SendScheduler:
+    """Paces every message the bridge sends to Telegram.
+
+    Callers ``acquire`` a slot before sending. Slots are granted in priority
+    order while both the global bucket and the bucket of the target chat
+    have a token, so the bridge stays under the flood limits instead of
+    waiting out a FloodWait after the fact. A waiter whose chat is out of
+    tokens does not hold up waiters for other chats.
+    """
+
+    def __init__(self, chat_rate: float, global_rate: float, report_interval: float = 30):
+        # chat_rate is in messages per minute, global_rate in messages per second
+        self.chat_rate = chat_rate / 60
+        self.chat_burst = max(1.0, min(5.0, chat_rate / 4))
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_buckets: Dict[Union[int, str], TokenBucket] = {}
+        self.report_interval = report_interval
+
+        self.waiting: List[Tuple[int, int, Union[int, str], asyncio.Future]] = []
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if isinstance(chat_id, int) and chat_id > 0:
+                bucket = TokenBucket(PRIVATE_RATE, PRIVATE_BURST)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: Union[int, str], priority: int = PRIORITY_REPLY):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiting, (priority, next(self.counter), chat_id, future))
+        self.wakeup.set()
+        await future
+
+    async def run(self):
+        next_report = time.monotonic() + self.report_interval
+
+        while True:
+            self.wakeup.clear()
+            now = time.monotonic()
+            sleep = self.grant(now)
+
+            if now >= next_report:
+                self.report()
+                next_report = now + self.report_interval
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=sleep)
+            except asyncio.TimeoutError:
+                pass
+
+    def grant(self, now: float) -> float:
+        """Grants every slot that can be sent now and returns how long to sleep."""
+        sleep = None
+        blocked = set()
+        remaining = []
+
+        for item in sorted(self.waiting):
+            priority, _, chat_id, future = item
+            if future.done():  # The caller gave up waiting
+                continue
+            if chat_id in blocked:
+                remaining.append(item)
+                continue
+
+            bucket = self.bucket(chat_id)
+            delay = max(self.global_bucket.delay(now), bucket.delay(now))
+            if delay > 0:
+                blocked.add(chat_id)
+                remaining.append(item)
+                sleep = delay if sleep is None else min(sleep, delay)
+                continue
+
+            self.global_bucket.take()
+            bucket.take()
+            future.set_result(None)
+
+        heapq.heapify(remaining)
+        self.waiting = remaining
+
+        return self.report_interval if sleep is None else sleep
+
+    def report(self):
+        if not self.waiting:
+            return
+
+        counts = {}
+        for priority, _, _, _ in self.waiting:
+            counts[priority] = counts.get(priority, 0) + 1
+
+        details = ", ".join(f"{counts[p]} {PRIORITY_NAMES.get(p, p)}" for p in sorted(counts))
+        logger.info(f"Telegram send backlog: {len(self.waiting)} messages waiting ({details})")
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
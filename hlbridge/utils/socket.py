@@ -2,45 +2,136 @@
 # Copyright (c) 2025 Elinsrc
 
 import asyncio
-import asyncio_dgram
-from typing import Union
+from typing import Callable, Dict, Optional, Tuple, Union
 from loguru import logger
 
+DatagramHandler = Callable[[bytes, Tuple[str, int]], None]
+
+
+class LogProtocol(asyncio.DatagramProtocol):
+    """Hands every received datagram to ``handler`` as soon as it arrives.
+
+    Datagrams are handled synchronously in ``datagram_received``, so a burst
+    is drained within one pass of the event loop instead of costing an
+    awaited future per packet.
+    """
+
+    def __init__(self, handler: DatagramHandler):
+        self.handler = handler
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        try:
+            self.handler(data, addr)
+        except Exception:
+            # An exception escaping here would close the transport
+            logger.exception(f"Failed to handle datagram from {addr[0]}:{addr[1]}")
+
+    def error_received(self, exc: Exception):
+        logger.warning(f"Socket error: {exc}")
+
+
+async def bind_datagram_endpoint(ip: str, port: int, handler: DatagramHandler) -> asyncio.DatagramTransport:
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: LogProtocol(handler), local_addr=(ip, port))
+    logger.info(f"Socket bound to {ip}:{port}")
+    return transport
+
+
+class ServerEndpoint(asyncio.DatagramProtocol):
+    """A connected datagram endpoint to one game server, kept open and reused.
+
+    Replies are not tagged, so request/response exchanges hold ``lock`` and
+    drop whatever arrived before their request was sent.
+    """
 
-class Socket:
     def __init__(self):
-        self.sock = None
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.replies: asyncio.Queue[bytes] = asyncio.Queue(maxsize=256)
+        self.lock = asyncio.Lock()
+        self.closed = False
+        # GoldSrc rcon challenge, b"" when the server does not use one
+        self.challenge: Optional[bytes] = None
 
-    async def connect(self, ip, port):
-        self.sock = await asyncio_dgram.bind((ip, port))
-        logger.info(f"Socket bound to {ip}:{port}")
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self.transport = transport
 
-    async def receive(self):
-        if self.sock is None:
-            logger.error("Socket is not connected!")
-            return
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
 
-        data, _ = await self.sock.recv()
-        return data
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        if not self.replies.full():
+            self.replies.put_nowait(data)
 
-    async def send_packet(self, ip, port, msg, timeout: float) -> Union[bytes, None]:
-        stream = await asyncio_dgram.connect((ip, port))
-        await stream.send(msg)
+    def error_received(self, exc: Exception):
+        # Usually ICMP port unreachable while the server is down
+        logger.debug(f"Socket error: {exc}")
+
+    def send(self, data: bytes):
+        self.transport.sendto(data)
+
+    def drain(self):
+        while not self.replies.empty():
+            self.replies.get_nowait()
+
+    async def recv(self, timeout: float) -> Union[bytes, None]:
         try:
-            data, _ = await asyncio.wait_for(stream.recv(), timeout=timeout)
+            return await asyncio.wait_for(self.replies.get(), timeout=timeout)
         except asyncio.TimeoutError:
-            data = None
-        finally:
-            stream.close()
+            return None
 
-        return data
+    async def query(self, data: bytes, timeout: float) -> Union[bytes, None]:
+        async with self.lock:
+            self.drain()
+            self.send(data)
+            return await self.recv(timeout)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class SocketPool:
+    """One long-lived connected endpoint per game server address."""
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, int], ServerEndpoint] = {}
+        self.lock = asyncio.Lock()
+
+    async def get(self, ip: str, port: int) -> ServerEndpoint:
+        endpoint = self.endpoints.get((ip, port))
+        if endpoint is not None and not endpoint.closed:
+            return endpoint
+
+        async with self.lock:
+            endpoint = self.endpoints.get((ip, port))
+            if endpoint is None or endpoint.closed:
+                loop = asyncio.get_running_loop()
+                _, endpoint = await loop.create_datagram_endpoint(ServerEndpoint, remote_addr=(ip, port))
+                self.endpoints[(ip, port)] = endpoint
+
+        return endpoint
+
+    def close(self, ip: str, port: int):
+        endpoint = self.endpoints.pop((ip, port), None)
+        if endpoint is not None:
+            endpoint.close()
+
+    def close_all(self):
+        for endpoint in self.endpoints.values():
+            endpoint.close()
+        self.endpoints.clear()
+
+
+udp_pool = SocketPool()
+
+
+class Socket:
+    """Request/response and fire-and-forget traffic to game servers over the shared pool."""
+
+    async def send_packet(self, ip, port, msg, timeout: float) -> Union[bytes, None]:
+        endpoint = await udp_pool.get(ip, port)
+        return await endpoint.query(msg, timeout)
 
     async def send_msg(self, ip, port, msg):
-        stream = await asyncio_dgram.connect((ip, port))
-        await stream.send(msg)
-        stream.close()
-
-    async def close(self):
-        if self.sock is not None:
-            self.sock.close()
-            logger.info("Socket closed!")
+        endpoint = await udp_pool.get(ip, port)
+        endpoint.send(msg)
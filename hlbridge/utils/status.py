@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .hlserver import HLServer
+from .netinfo import PlayerInfo, ServerInfo
+
+ServerKey = Tuple[str, int, int]
+
+
+class ServerStatus:
+    """Server info and player list of one server, ``info`` is None if it did not answer."""
+
+    __slots__ = ("info", "players", "fetched")
+
+    def __init__(self, info: Optional[ServerInfo], players: List[PlayerInfo], fetched: float):
+        self.info = info
+        self.players = players
+        self.fetched = fetched
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched
+
+
+class StatusCache:
+    """Server info and player lists, shared by everyone asking for a status.
+
+    A status is reused for ``ttl`` seconds. While a server is being queried,
+    further requests for it wait for that query instead of sending their own.
+    """
+
+    def __init__(self, ttl: float, timeout: float = 0.5):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.statuses: Dict[ServerKey, ServerStatus] = {}
+        self.inflight: Dict[ServerKey, asyncio.Task] = {}
+
+    async def get(self, ip: str, port: int, protocol: int) -> ServerStatus:
+        key = (ip, port, protocol)
+
+        status = self.statuses.get(key)
+        if status is not None and status.age < self.ttl:
+            return status
+
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.fetch(key))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+
+        # A waiter that gives up must not cancel the query for the others
+        return await asyncio.shield(task)
+
+    async def fetch(self, key: ServerKey) -> ServerStatus:
+        server = HLServer(*key, timeout=self.timeout)
+        info, players = await server.get_status()
+
+        status = ServerStatus(info, players, time.monotonic())
+        self.statuses[key] = status
+        return status
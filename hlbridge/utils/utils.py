@@ -12,7 +12,6 @@ import math
 import operator
 import re
 from datetime import datetime, timedelta
-from subprocess import run
 from functools import partial
 from string import Formatter
 
@@ -39,8 +38,8 @@ async def check_perms(
     else:
         sender = message.reply_text
         chat = message.chat
-    # TODO: Cache all admin permissions in db.
-    user = await chat.get_member(message.from_user.id)
+    from hlbridge.database.chat_members import member_cache
+    user = await member_cache.get(chat, message.from_user.id)
     if user.status == ChatMemberStatus.OWNER:
         return True
 
@@ -133,24 +132,6 @@ def format_time(seconds):
     return ' '.join(time_components)
 
 
-def get_commit():
-    return (
-        run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=False)
-        .stdout.decode()
-        .strip()
-        or "None"
-    )
-
-
-def get_version_number():
-    return (
-        run(["git", "rev-list", "--count", "HEAD"], capture_output=True, check=False)
-        .stdout.decode()
-        .strip()
-        or "0"
-    )
-
-
 class InterceptHandler(logging.Handler):
     def emit(self, record):
         try:
@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from functools import lru_cache
+from pathlib import Path
+from subprocess import run
+from typing import Optional, Tuple
+
+
+# Written at install time by `python3 hlbridge/utils/version.py`, inside the package
+VERSION_FILE = Path(__file__).resolve().parent.parent / ".version"
+
+
+def git(*args: str) -> Optional[str]:
+    try:
+        result = run(["git", *args], capture_output=True, check=False, cwd=VERSION_FILE.parent)
+    except OSError:
+        return None
+    return result.stdout.decode().strip() or None
+
+
+def read_git_version() -> Optional[Tuple[str, str]]:
+    number = git("rev-list", "--count", "HEAD")
+    commit = git("rev-parse", "--short", "HEAD")
+    if number is None or commit is None:
+        return None
+    return number, commit
+
+
+def read_recorded_version() -> Optional[Tuple[str, str]]:
+    try:
+        number, commit = VERSION_FILE.read_text().split()
+    except (OSError, ValueError):
+        return None
+    return number, commit
+
+
+@lru_cache(maxsize=None)
+def get_version() -> Tuple[str, str]:
+    """Returns the version number and commit recorded at install time.
+
+    A checkout without a recorded version asks git instead, once per run.
+    """
+    return read_recorded_version() or read_git_version() or ("0", "None")
+
+
+def get_version_number() -> str:
+    return get_version()[0]
+
+
+def get_commit() -> str:
+    return get_version()[1]
+
+
+if __name__ == "__main__":
+    version = read_git_version()
+    if version is None:
+        raise SystemExit("git could not describe the current checkout")
+    VERSION_FILE.write_text("{} {}\n".format(*version))
+    print("r{} ({})".format(*version))
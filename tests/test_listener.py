@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+from hlbridge.utils.listener import LogPipeline
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.lines = []
+
+    def submit(self, text, priority=0):
+        self.lines.append(text)
+
+
+class FakeHistory:
+    def __init__(self):
+        self.events = []
+
+    def add(self, server_name, event):
+        self.events.append((server_name, event.type, event.text))
+
+
+def datagram(action: str) -> bytes:
+    line = f'log L 10/18/2026 - 10:00:00: "Alice<3><STEAM_0:0:9><blue>" {action}\n'
+    return b"\xff\xff\xff\xff" + line.encode()
+
+
+def test_chat_is_archived_when_not_relayed():
+    outbox = FakeOutbox()
+    history = FakeHistory()
+    pipeline = LogPipeline("crossfire", 48, ("say", "map"), outbox, history)
+
+    pipeline.feed(datagram('say_team "cover me"'))
+    pipeline.feed(datagram('say "hello"'))
+
+    assert history.events == [("crossfire", "say_team", "cover me"), ("crossfire", "say", "hello")]
+    assert len(outbox.lines) == 1
+    assert "hello" in outbox.lines[0]
+
+
+def test_configure_keeps_archiving_chat():
+    outbox = FakeOutbox()
+    history = FakeHistory()
+    pipeline = LogPipeline("crossfire", 48, ("say",), outbox, history)
+    pipeline.configure(48, ("map",))
+
+    pipeline.feed(datagram('say "hello"'))
+
+    assert history.events == [("crossfire", "say", "hello")]
+    assert outbox.lines == []
+
+
+def test_chat_is_not_parsed_without_history():
+    outbox = FakeOutbox()
+    pipeline = LogPipeline("crossfire", 48, ("map",), outbox)
+
+    pipeline.feed(datagram('say "hello"'))
+
+    assert outbox.lines == []
+    assert "say" not in pipeline.parser.events
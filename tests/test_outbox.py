@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2025 Elinsrc
+
+import asyncio
+from types import SimpleNamespace
+
+from hlbridge.utils.outbox import Outbox
+
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append(text)
+        return SimpleNamespace(id=len(self.sent))
+
+
+async def relay(outbox: Outbox, lines, wait: float = 0.1):
+    outbox.start()
+    for line in lines:
+        outbox.submit(line)
+    await asyncio.sleep(wait)
+    await outbox.close()
+
+
+def test_zero_window_sends_every_line_alone():
+    client = FakeClient()
+    outbox = Outbox(client, 1, 2, window=0)
+    asyncio.run(relay(outbox, [f"line {i}" for i in range(5)]))
+    assert client.sent == [f"line {i}" for i in range(5)]
+
+
+def test_window_merges_lines():
+    client = FakeClient()
+    outbox = Outbox(client, 1, 2, window=0.05)
+    asyncio.run(relay(outbox, [f"line {i}" for i in range(5)]))
+    assert client.sent == ["\n".join(f"line {i}" for i in range(5))]
+
+
+def test_skipped_note_fits_in_a_full_message():
+    client = FakeClient()
+    outbox = Outbox(client, 1, 2, window=0.05, max_chars=100, queue_size=10, overflow="summarize")
+    asyncio.run(relay(outbox, ["x" * 9] * 15))
+    assert all(len(text) <= 100 for text in client.sent)
+    assert "[5 lines skipped]" in client.sent[0]
+    assert outbox.skipped == 0